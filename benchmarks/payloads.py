@@ -0,0 +1,84 @@
+import random
+from enum import Enum
+from typing import Any
+
+from pyrus_orm.fields import (
+    TextField, NumericField, IntegerField, DateField, TimeField, DueDateTimeField, CheckmarkField, CatalogField,
+    CatalogEnumField, MultipleChoiceField, StepField,
+)
+from pyrus_orm.model import PyrusModel
+
+FORM_ID = 1
+CATALOG_ID = 10
+CATALOG_HEADERS = ['Name', 'Code', 'Country']
+TITLE_FIELD_ID = 100
+
+
+class Kind(Enum):
+    first = 'c0'
+    second = 'c1'
+    third = 'c2'
+
+
+class Color(Enum):
+    red = 1
+    green = 2
+    blue = 3
+
+
+class BenchModel(PyrusModel):
+    title = TextField(1)
+    amount = NumericField(2)
+    count = IntegerField(3)
+    day = DateField(4)  # inside the title field
+    time = TimeField(5)  # inside the title field
+    due = DueDateTimeField(6)
+    done = CheckmarkField(7)
+    vendor = CatalogField(8, catalog_id=CATALOG_ID)
+    kind = CatalogEnumField(9, catalog_id=CATALOG_ID, enum=Kind, id_field='Code')
+    colors = MultipleChoiceField(10, enum=Color)
+    step = StepField(11)
+
+    class Meta:
+        form_id = FORM_ID
+
+
+def make_catalog_rows(rows: int) -> list[tuple[int, list[str]]]:
+    return [(1000 + i, [f'Vendor {i}', f'c{i}', f'Country {i % 50}']) for i in range(rows)]
+
+
+def _catalog_value(item_id: int, values: list[str]) -> dict[str, Any]:
+    return {'item_id': item_id, 'item_ids': [item_id], 'headers': CATALOG_HEADERS, 'values': values}
+
+
+def make_task(task_id: int, rnd: random.Random, catalog_rows: list[tuple[int, list[str]]]) -> dict[str, Any]:
+    vendor_id, vendor_values = rnd.choice(catalog_rows)
+    kind_id, kind_values = catalog_rows[rnd.randrange(min(3, len(catalog_rows)))]
+    return {
+        'id': task_id,
+        'create_date': '2020-01-01T10:00:00Z',
+        'last_modified_date': '2020-01-02T10:00:00Z',
+        'current_step': 1,
+        'fields': [
+            {'id': 1, 'type': 'text', 'name': 'Title', 'value': f'Task {task_id} ' + 'x' * rnd.randrange(100)},
+            {'id': 2, 'type': 'number', 'name': 'Amount', 'value': rnd.random() * 1000},
+            {'id': 3, 'type': 'number', 'name': 'Count', 'value': rnd.randrange(1000)},
+            {'id': TITLE_FIELD_ID, 'type': 'title', 'name': 'Dates', 'value': {'fields': [
+                {'id': 4, 'type': 'date', 'name': 'Day', 'value': f'2020-{rnd.randrange(1, 13):02}-15'},
+                {'id': 5, 'type': 'time', 'name': 'Time', 'value': f'{rnd.randrange(24):02}:30'},
+            ]}},
+            {'id': 6, 'type': 'due_date_time', 'name': 'Due', 'value': '2020-03-01T12:00:00Z'},
+            {'id': 7, 'type': 'checkmark', 'name': 'Done', 'value': rnd.choice(['checked', 'unchecked'])},
+            {'id': 8, 'type': 'catalog', 'name': 'Vendor', 'value': _catalog_value(vendor_id, vendor_values)},
+            {'id': 9, 'type': 'catalog', 'name': 'Kind', 'value': _catalog_value(kind_id, kind_values)},
+            {'id': 10, 'type': 'multiple_choice', 'name': 'Colors', 'value': {
+                'choice_ids': rnd.sample([1, 2, 3], rnd.randrange(1, 4)),
+            }},
+            {'id': 11, 'type': 'step', 'name': 'Step', 'value': 1},
+        ],
+    }
+
+
+def make_register(tasks: int, catalog_rows: list[tuple[int, list[str]]], seed: int = 0) -> list[dict[str, Any]]:
+    rnd = random.Random(seed)
+    return [make_task(task_id, rnd, catalog_rows) for task_id in range(1, tasks + 1)]
@@ -0,0 +1,197 @@
+"""
+Benchmarks of model decoding/encoding and catalog operations on synthetic registers and catalogs.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --tasks 1000 100000 --catalog-rows 1000 100000
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+
+Every benchmark is run `--repeat` times, the best time is reported. Peak memory is measured by tracemalloc
+in a separate run. With --compare the exit code is 1 if any benchmark is slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from pyrus import PyrusAPI
+
+from pyrus_orm.jsoncodec import JSONCodec, MsgspecCodec, OrjsonCodec
+from pyrus_orm.session import PyrusORMSession, set_session
+
+from .payloads import CATALOG_HEADERS, CATALOG_ID, BenchModel, Kind, make_catalog_rows, make_register
+
+FIND_LOOKUPS = 1000
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}[{self.size}]'
+
+
+def measure(func: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def model_benchmarks(tasks: list[dict[str, Any]]) -> dict[str, Callable[[], Any]]:
+    models = [BenchModel.from_pyrus_data(x) for x in tasks]
+
+    def catalog_enum_set() -> None:
+        for model in models:
+            model.kind = Kind.second
+
+    return {
+        'from_pyrus_data': lambda: [BenchModel.from_pyrus_data(x) for x in tasks],
+        'from_pyrus_data_lazy': lambda: [BenchModel.from_pyrus_data(x, lazy=True) for x in tasks],
+        'get_pyrus_fields_data': lambda: [x.get_pyrus_fields_data() for x in models],
+        'as_dict': lambda: [x.as_dict() for x in models],
+        'catalog_field_get': lambda: [x.vendor for x in models],
+        'catalog_enum_get': lambda: [x.kind for x in models],
+        'catalog_enum_set': catalog_enum_set,
+    }
+
+
+def json_benchmarks(tasks: list[dict[str, Any]]) -> dict[str, Callable[[], Any]]:
+    # decoding of a register response with every installed codec
+    raw = JSONCodec().dumps({'tasks': tasks})
+    benchmarks = {}
+    for codec_cls in (JSONCodec, OrjsonCodec, MsgspecCodec):
+        try:
+            codec = codec_cls()
+        except ImportError:
+            continue
+        benchmarks[f'json_loads_{codec.name}'] = lambda codec=codec: codec.loads(raw)
+    return benchmarks
+
+
+def catalog_benchmarks(session: PyrusORMSession, rows: list[tuple[int, list[str]]]) -> dict[str, Callable[[], Any]]:
+    catalog = session._make_catalog(CATALOG_ID, CATALOG_HEADERS, rows)
+    rnd = random.Random(0)
+    patterns = [{'Code': rows[rnd.randrange(len(rows))][1][1]} for _ in range(FIND_LOOKUPS)]
+    catalog.find(patterns[0])  # index is built on the first lookup
+
+    def find_cold() -> None:
+        fresh = session._make_catalog(CATALOG_ID, CATALOG_HEADERS, rows)
+        fresh.find(patterns[0])
+
+    return {
+        'catalog_load': lambda: session._make_catalog(CATALOG_ID, CATALOG_HEADERS, rows),
+        'catalog_find_cold': find_cold,
+        f'catalog_find_x{FIND_LOOKUPS}': lambda: [catalog.find(x) for x in patterns],
+        'catalog_find_all': lambda: catalog.find_all({'Country': 'Country 7'}),
+    }
+
+
+def run(task_sizes: list[int], catalog_sizes: list[int], repeat: int, only: Optional[str]) -> list[Result]:
+    session = PyrusORMSession(PyrusAPI(access_token='benchmark'))
+    results = []
+
+    def bench(name: str, size: int, func: Callable[[], Any], items: Optional[int] = None) -> None:
+        if only and only not in name:
+            return
+        seconds, peak = measure(func, repeat)
+        result = Result(name, size, seconds, peak)
+        results.append(result)
+        print(f'{result.key:<40} {seconds * 1000:>10.2f} ms {seconds / (items or size) * 1e6:>10.2f} us/item '
+              f'{peak / 2 ** 20:>10.2f} MiB', flush=True)
+
+    with set_session(session):
+        # models reference the smallest catalog, CatalogEnumField setter looks items up in it
+        model_rows = make_catalog_rows(min(catalog_sizes))
+        session.catalog_cache.set(CATALOG_ID, session._make_catalog(CATALOG_ID, CATALOG_HEADERS, model_rows))
+
+        for size in task_sizes:
+            tasks = make_register(size, model_rows)
+            for name, func in {**model_benchmarks(tasks), **json_benchmarks(tasks)}.items():
+                bench(name, size, func)
+
+        for size in catalog_sizes:
+            for name, func in catalog_benchmarks(session, make_catalog_rows(size)).items():
+                bench(name, size, func, items=FIND_LOOKUPS if name.startswith('catalog_find_x') else None)
+
+    return results
+
+
+def save_baseline(path: str, results: list[Result]) -> None:
+    data = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {x.key: {'seconds': x.seconds, 'peak_bytes': x.peak_bytes} for x in results},
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare(path: str, results: list[Result], threshold: float) -> bool:
+    # Returns False if any benchmark regressed by more than the threshold
+    with open(path) as f:
+        baseline = json.load(f)['results']
+
+    ok = True
+    print(f'\n{"benchmark":<40} {"time":>10} {"memory":>10}  (vs {path})')
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            print(f'{result.key:<40} {"new":>10}')
+            continue
+
+        time_ratio = result.seconds / base['seconds']
+        memory_ratio = result.peak_bytes / base['peak_bytes'] if base['peak_bytes'] else 1.0
+        regressed = time_ratio > 1 + threshold
+        ok = ok and not regressed
+        print(f'{result.key:<40} {time_ratio:>9.2f}x {memory_ratio:>9.2f}x' + ('  REGRESSION' if regressed else ''))
+
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 10000], help='register sizes')
+    parser.add_argument('--catalog-rows', type=int, nargs='+', default=[1000, 100000], help='catalog sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help='run benchmarks with this substring in the name')
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown, 0.1 is 10%%')
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.catalog_rows, args.repeat, args.only)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    if args.compare and not compare(args.compare, results, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
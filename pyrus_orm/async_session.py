@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, TYPE_CHECKING, Iterable, Callable, TypeVar
+
+from .cache import CatalogCache
+from .events import Hook
+from .identity_map import IdentityMap
+from .jsoncodec import JSONCodec
+from .scheduler import RequestScheduler
+from .session import PyrusORMSession, get_session
+from .snapshot import CatalogSnapshotStore
+from .transport import Transport
+
+if TYPE_CHECKING:
+    from pyrus import PyrusAPI
+    from pyrus.models.entities import FormRegisterFilter
+    from pyrus_orm.catalog import _CatalogListWrapper
+
+R = TypeVar('R')
+
+
+class AsyncPyrusORMSession(PyrusORMSession):
+    """
+    Session with coroutine counterparts (a-prefixed) of the session methods.
+
+    pyrus-api is blocking, so requests are run on a pool of `max_concurrency` worker threads owned by the session;
+    any number of coroutines may await them concurrently. Blocking methods keep working as well.
+    """
+
+    def __init__(
+        self,
+        pyrus_api: PyrusAPI,
+        catalog_cache: Optional[CatalogCache] = None,
+        catalog_snapshot: Optional[CatalogSnapshotStore] = None,
+        identity_map: Optional[IdentityMap] = None,
+        transport: Optional[Transport] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        hooks: Iterable[Hook] = (),
+        json_codec: Optional[JSONCodec] = None,
+        max_concurrency: int = 10,
+    ):
+        super().__init__(
+            pyrus_api,
+            catalog_cache=catalog_cache,
+            catalog_snapshot=catalog_snapshot,
+            identity_map=identity_map,
+            transport=transport,
+            scheduler=scheduler,
+            hooks=hooks,
+            json_codec=json_codec,
+        )
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def aget_catalog(self, catalog_id: int) -> _CatalogListWrapper:
+        return await self._run(self.get_catalog, catalog_id)
+
+    async def aget_task_raw(self, task_id: int) -> dict[str, Any]:
+        return await self._run(self.get_task_raw, task_id)
+
+    async def aupdate_task(
+        self,
+        task_id: int,
+        field_updates: list[Any],
+        comment: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return await self._run(self.update_task, task_id, field_updates, comment)
+
+    async def acreate_task(self, data: dict[str, Any]) -> dict[str, Any]:
+        return await self._run(self.create_task, data)
+
+    async def aget_filtered_tasks(
+        self,
+        form_id: int,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        filters: Iterable[FormRegisterFilter] = (),
+        only: Iterable[int] = (),
+        modified_after: Optional[datetime] = None,
+    ) -> list[dict[str, Any]]:
+        return await self._run(
+            self.get_filtered_tasks,
+            form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=filters,
+            only=only,
+            modified_after=modified_after,
+        )
+
+    async def acomment_task(self, task_id: int, comment: str) -> None:
+        await self._run(self.comment_task, task_id, comment)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        super().close()
+
+    async def _run(self, func: Callable[..., R], *args, **kwargs) -> R:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='pyrus-orm',
+            )
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(context.run, func, *args, **kwargs))
+
+
+def get_async_session() -> AsyncPyrusORMSession:
+    session = get_session()
+    assert isinstance(session, AsyncPyrusORMSession), 'current pyrus-orm session is not an AsyncPyrusORMSession'
+    return session
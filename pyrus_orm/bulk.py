@@ -0,0 +1,45 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+K = TypeVar('K')
+R = TypeVar('R')
+
+
+@dataclass
+class BulkResult(Generic[K, R]):
+    key: K
+    result: Optional[R] = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_bulk(
+    func: Callable[[K], R],
+    keys: Iterable[K],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+) -> Iterator[BulkResult[K, R]]:
+    # Calls func for every key on a pool of `concurrency` threads, in copies of the caller's context
+    # (so the current session is the same as the caller's).
+    # Errors are reported per key, results are yielded in keys order or as they complete.
+    assert concurrency > 0, 'concurrency must be positive'
+
+    context = contextvars.copy_context()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='pyrus-orm')
+    try:
+        futures = {executor.submit(context.copy().run, func, key): key for key in keys}
+        for future in (futures if ordered else as_completed(futures)):
+            key = futures[future]
+            try:
+                yield BulkResult(key, result=future.result())
+            except Exception as e:
+                yield BulkResult(key, error=e)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyrus_orm.catalog import _CatalogListWrapper
+
+logger = logging.getLogger(__name__)
+
+CatalogLoader = Callable[[int], '_CatalogListWrapper']
+
+
+@dataclass
+class _CacheEntry:
+    catalog: _CatalogListWrapper
+    loaded_at: float
+
+
+class CatalogCache:
+    """
+    Size-bounded LRU cache of catalogs with optional expiration.
+
+    ttl: seconds a catalog stays fresh (None - never expires), `ttls` overrides it for specific catalogs.
+    revalidate: expired catalog is refetched in background thread while the stale one is returned.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: Optional[float] = None,
+        ttls: Optional[dict[int, Optional[float]]] = None,
+        revalidate: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.revalidate = revalidate
+        self._clock = clock
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._refreshing: set[int] = set()
+        self._load_locks: dict[int, threading.Lock] = {}
+        self._lock = threading.RLock()
+
+    def get(self, catalog_id: int, loader: CatalogLoader) -> _CatalogListWrapper:
+        with self._lock:
+            entry = self._entries.get(catalog_id)
+            if entry is not None:
+                self._entries.move_to_end(catalog_id)
+                if not self._is_expired(catalog_id, entry):
+                    return entry.catalog
+
+                if self.revalidate:
+                    if catalog_id not in self._refreshing:
+                        self._refreshing.add(catalog_id)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(catalog_id, loader),
+                            name=f'pyrus-orm-catalog-{catalog_id}',
+                            daemon=True,
+                        ).start()
+                    return entry.catalog
+
+            load_lock = self._load_locks.setdefault(catalog_id, threading.Lock())
+
+        # concurrent misses of the same catalog wait for a single load
+        with load_lock:
+            try:
+                with self._lock:
+                    entry = self._entries.get(catalog_id)
+                    if entry is not None and not self._is_expired(catalog_id, entry):
+                        return entry.catalog
+
+                catalog = loader(catalog_id)
+                self.set(catalog_id, catalog)
+                return catalog
+            finally:
+                with self._lock:
+                    if self._load_locks.get(catalog_id) is load_lock:
+                        del self._load_locks[catalog_id]
+
+    def peek(self, catalog_id: int) -> Optional[_CatalogListWrapper]:
+        # Returns cached catalog (even expired one) without loading it
+        with self._lock:
+            entry = self._entries.get(catalog_id)
+            return entry.catalog if entry is not None else None
+
+    def set(self, catalog_id: int, catalog: _CatalogListWrapper) -> None:
+        with self._lock:
+            self._entries[catalog_id] = _CacheEntry(catalog, self._clock())
+            self._entries.move_to_end(catalog_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, catalog_id: int) -> None:
+        with self._lock:
+            self._entries.pop(catalog_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, catalog_id: int) -> bool:
+        with self._lock:
+            return catalog_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _is_expired(self, catalog_id: int, entry: _CacheEntry) -> bool:
+        ttl = self.ttls.get(catalog_id, self.ttl)
+        return ttl is not None and self._clock() - entry.loaded_at >= ttl
+
+    def _refresh(self, catalog_id: int, loader: CatalogLoader) -> None:
+        try:
+            self.set(catalog_id, loader(catalog_id))
+        except Exception:
+            logger.exception('failed to refresh catalog %s, stale copy is kept', catalog_id)
+        finally:
+            with self._lock:
+                self._refreshing.discard(catalog_id)
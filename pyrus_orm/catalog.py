@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Optional, TypedDict, Any, TYPE_CHECKING, Callable
+from typing import Optional, TypedDict, Any, TYPE_CHECKING, Callable, Iterable, TypeVar
 
 if TYPE_CHECKING:
     pass
 
+R = TypeVar('R')
+
 
 class PyrusCatalogSingleItem(TypedDict):
     item_id: int
@@ -14,14 +16,47 @@ class PyrusCatalogSingleItem(TypedDict):
 
 
 class _CatalogListWrapper(list['CatalogItem']):
+    # Lookup indexes are built on first use of every set of pattern keys.
+    # Catalogs are cached by the session together with their indexes, so the catalog must not be modified.
+    _indexes: dict[tuple[str, ...], dict[tuple[Any, ...], list['CatalogItem']]]
+    _by_id: Optional[dict[int, 'CatalogItem']]
+    _derived: dict[Any, Any]
+
+    def __init__(self, items: Iterable['CatalogItem'] = ()):
+        super().__init__(items)
+        self._indexes = {}
+        self._by_id = None
+        self._derived = {}
+
+    def get_derived(self, key: Any, build: Callable[['_CatalogListWrapper'], R]) -> R:
+        # Data computed from the catalog (e.g. enum mappings) is kept with it,
+        # so it's built once per catalog version and dropped together with it
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build(self)
+        return value
+
+    def get_by_id(self, item_id: int) -> Optional['CatalogItem']:
+        if self._by_id is None:
+            self._by_id = {item.item_id: item for item in self}
+        return self._by_id.get(item_id)
+
+    def _get_index(self, keys: tuple[str, ...]) -> dict[tuple[Any, ...], list['CatalogItem']]:
+        index = self._indexes.get(keys)
+        if index is None:
+            index = {}
+            for item in self:
+                index.setdefault(tuple(item.values[k] for k in keys), []).append(item)
+            self._indexes[keys] = index
+        return index
+
     def find(self, pattern: dict[str, Any]) -> Optional['CatalogItem']:
-        for item in self:
-            for k, v in pattern.items():
-                if item.values[k] != v:
-                    break
-            else:
-                return item
-        return None
+        items = self.find_all(pattern)
+        return items[0] if items else None
+
+    def find_all(self, pattern: dict[str, Any]) -> list['CatalogItem']:
+        keys = tuple(sorted(pattern))
+        return list(self._get_index(keys).get(tuple(pattern[k] for k in keys), ()))
 
 
 class _CatalogMixin:
@@ -34,7 +69,7 @@ class _CatalogMixin:
         from pyrus_orm.session import get_session
         assert self.catalog_id, 'catalog_id is not set'
 
-        return _CatalogListWrapper(get_session().get_catalog(self.catalog_id))
+        return get_session().get_catalog(self.catalog_id)
 
 
 @dataclass
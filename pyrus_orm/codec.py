@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from .fields import BaseField
+
+if TYPE_CHECKING:
+    from .model import PyrusModel
+
+_CONTAINERS = frozenset({dict, list})
+
+
+def copy_json(value: Any) -> Any:
+    # Deep copy of JSON data (dicts, lists and scalars), many times cheaper than copy.deepcopy
+    if type(value) is dict:
+        return {k: copy_json(v) if type(v) in _CONTAINERS else v for k, v in value.items()}
+    if type(value) is list:
+        return [copy_json(v) if type(v) in _CONTAINERS else v for v in value]
+    return value
+
+
+def add_field_note(e: Exception, model: PyrusModel, struct: Any) -> None:
+    if sys.version_info >= (3, 11):
+        e.add_note(f"Task id: {model.id}, field struct: {struct}")
+
+
+def _overrides(field: BaseField, method: str) -> bool:
+    return getattr(type(field), method).__func__ is not getattr(BaseField, method).__func__
+
+
+class ModelCodec:
+    """
+    Field decoder and encoder of a model class, built once when the class is defined.
+
+    Fields are kept sorted by id, so encoded fields need no sorting. Decoding is a generated straight-line
+    function with a block per field; fields stored as is (text, catalog, ...) skip the deserializer call.
+    """
+
+    def __init__(self, model_name: str, fields: dict[str, BaseField]):
+        self.fields_by_id: dict[int, BaseField] = {x.id: x for x in fields.values()}
+        self.sorted_fields: tuple[BaseField, ...] = tuple(sorted(fields.values(), key=lambda x: x.id))
+        # (field, serializer or None if values are stored in pyrus format)
+        self.encoders: tuple[tuple[BaseField, Optional[Callable[[Any], Any]]], ...] = tuple(
+            (x, x.serialize_to_pyrus if _overrides(x, 'serialize_to_pyrus') else None)
+            for x in self.sorted_fields
+        )
+        self.decode_fields = self._compile_decoder(model_name)
+
+    def _compile_decoder(
+        self,
+        model_name: str,
+    ) -> Callable[[PyrusModel, dict[int, Any], dict[int, Any]], None]:
+        # decode_fields(model, raw_field_values, field_values) decodes every field of the model,
+        # the same way model._get_field_struct() does for a single one
+        namespace: dict[str, Any] = {'add_field_note': add_field_note}
+        lines = ['def decode_fields(model, raw_values, field_values):']
+
+        for i, field in enumerate(self.sorted_fields):
+            field_id = repr(field.id)
+            lines += [
+                f'    raw = raw_values.pop({field_id}, None)',
+                '    if raw is not None:',
+                '        struct = dict(raw)',
+            ]
+            if _overrides(field, 'deserialize_from_pyrus'):
+                namespace[f'deserialize_{i}'] = field.deserialize_from_pyrus
+                lines += [
+                    '        value = struct.get("value")',
+                    '        if value is not None:',
+                    '            try:',
+                    f'                struct["value"] = deserialize_{i}(value)',
+                    '            except Exception as e:',
+                    '                add_field_note(e, model, raw)',
+                    '                raise',
+                ]
+            lines += [
+                f'        field_values[{field_id}] = struct',
+                f'    elif {field_id} not in field_values:',
+                f'        field_values[{field_id}] = {{"id": {field_id}}}',
+            ]
+        lines.append('    return None')
+
+        exec(compile('\n'.join(lines), f'<pyrus_orm decoder of {model_name}>', 'exec'), namespace)
+        return namespace['decode_fields']
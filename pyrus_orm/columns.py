@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Literal, TYPE_CHECKING, Type
+
+from .fields import BaseField
+from .utils import flatten_fields
+
+if TYPE_CHECKING:
+    from .model import PyrusModel
+
+ColumnsFormat = Literal['python', 'numpy', 'arrow']
+
+
+def decode_columns(
+    model: Type[PyrusModel],
+    tasks: Iterable[dict[str, Any]],
+    field_names: Iterable[str],
+) -> dict[str, list[Any]]:
+    # Decodes raw register tasks into a list of values per field, no models are built.
+    # Task ids are stored in 'id' column.
+    fields: list[tuple[str, BaseField]] = [(x, model.Meta.fields[x]) for x in field_names]
+
+    ids: list[int] = []
+    columns: dict[str, list[Any]] = {'id': ids}
+    appenders = []
+    for name, field in fields:
+        column: list[Any] = []
+        columns[name] = column
+        appenders.append((field.id, field.to_column_value, column.append))
+
+    for task in tasks:
+        ids.append(task['id'])
+        values = flatten_fields(task['fields'])
+        for field_id, to_column_value, append in appenders:
+            struct = values.get(field_id)
+            append(to_column_value(struct.get('value') if struct is not None else None))
+
+    return columns
+
+
+def decode_rows(
+    model: Type[PyrusModel],
+    tasks: Iterable[dict[str, Any]],
+    field_names: Iterable[str],
+) -> Iterator[tuple[Any, ...]]:
+    # Decodes raw register tasks into tuples of values, as model.as_dict() returns them, no models are built.
+    # 'id' is the task id.
+    decoders = [
+        (None, None) if x == 'id' else (model.Meta.fields[x].id, model.Meta.fields[x].to_python_value)
+        for x in field_names
+    ]
+
+    for task in tasks:
+        values = flatten_fields(task['fields'])
+        row = []
+        for field_id, to_python_value in decoders:
+            if field_id is None:
+                row.append(task['id'])
+                continue
+            struct = values.get(field_id)
+            row.append(to_python_value(struct.get('value') if struct is not None else None))
+        yield tuple(row)
+
+
+def to_numpy(model: Type[PyrusModel], columns: dict[str, list[Any]]) -> dict[str, Any]:
+    # int64 columns with missing values become masked arrays, float64 ones get nan, datetime64 ones get NaT
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError('numpy is required for numpy columns format') from e
+
+    arrays = {}
+    for name, values in columns.items():
+        column_type = 'int64' if name == 'id' else model.Meta.fields[name].column_type
+
+        if column_type == 'float64':
+            arrays[name] = np.array([np.nan if x is None else x for x in values], dtype=np.float64)
+        elif column_type == 'int64':
+            mask = [x is None for x in values]
+            data = np.array([0 if x is None else x for x in values], dtype=np.int64)
+            arrays[name] = np.ma.masked_array(data, mask=mask) if any(mask) else data
+        elif column_type.startswith('datetime64'):
+            arrays[name] = np.array([_to_naive_utc(x) for x in values], dtype=column_type)
+        elif column_type == 'bool':
+            arrays[name] = np.array(values, dtype=np.bool_)
+        else:
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            arrays[name] = array
+
+    return arrays
+
+
+def to_arrow(model: Type[PyrusModel], columns: dict[str, list[Any]]) -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError('pyarrow is required for arrow columns format') from e
+
+    types = {
+        'float64': pa.float64(),
+        'int64': pa.int64(),
+        'bool': pa.bool_(),
+        'datetime64[D]': pa.date32(),
+        'datetime64[s]': pa.timestamp('s', tz='UTC'),
+    }
+
+    arrays = {}
+    for name, values in columns.items():
+        column_type = 'int64' if name == 'id' else model.Meta.fields[name].column_type
+        arrays[name] = pa.array(values, type=types.get(column_type))
+
+    return pa.table(arrays)
+
+
+def _to_naive_utc(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
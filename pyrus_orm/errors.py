@@ -0,0 +1,54 @@
+from typing import Any, Optional
+
+
+class PyrusORMError(Exception):
+    pass
+
+
+class PyrusConnectionError(PyrusORMError):
+    # network failure or timeout, no response from the API
+    pass
+
+
+class PyrusAPIError(PyrusORMError):
+    def __init__(self, message: Any, *, error_code: Optional[str] = None, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.status_code = status_code
+
+
+class PyrusAuthError(PyrusAPIError):
+    pass
+
+
+class PyrusNotFoundError(PyrusAPIError):
+    pass
+
+
+class PyrusRateLimitError(PyrusAPIError):
+    def __init__(self, *args, retry_after: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class PyrusServerError(PyrusAPIError):
+    pass
+
+
+def make_api_error(
+    status_code: int,
+    data: dict[str, Any],
+    retry_after: Optional[float] = None,
+) -> PyrusAPIError:
+    message = data.get('error') or f'pyrus api responded with status {status_code}'
+    kwargs: dict[str, Any] = {'error_code': data.get('error_code'), 'status_code': status_code}
+
+    if status_code in (401, 403):
+        return PyrusAuthError(message, **kwargs)
+    if status_code == 404:
+        return PyrusNotFoundError(message, **kwargs)
+    if status_code == 429:
+        return PyrusRateLimitError(message, retry_after=retry_after, **kwargs)
+    if status_code >= 500:
+        return PyrusServerError(message, **kwargs)
+    return PyrusAPIError(message, **kwargs)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """
+    Something measurable that happened in a session.
+
+    name is one of:
+      request - an API request (endpoint, status_code, bytes of the response body, form_id, task_count, error)
+      retry - a request is going to be retried after `duration` seconds (endpoint, status_code, error)
+      decode - a task received from the API was turned into a model (form_id, task_id)
+      catalog - a catalog was requested from the session (catalog_id, hit: found in the cache)
+      save, save_skipped - a model was saved, or wasn't because nothing had changed (form_id, task_id)
+    Durations are in seconds.
+    """
+    name: str
+    duration: Optional[float] = None
+    endpoint: Optional[str] = None  # method and path with ids replaced, e.g. 'GET /tasks/{id}'
+    status_code: Optional[int] = None
+    bytes: Optional[int] = None
+    form_id: Optional[int] = None
+    task_id: Optional[int] = None
+    task_count: Optional[int] = None
+    catalog_id: Optional[int] = None
+    hit: Optional[bool] = None
+    error: Optional[str] = None  # exception class name
+
+
+Hook = Callable[[Event], None]
+
+
+class Histogram:
+    # Cumulative histogram of durations in seconds, the same layout as Prometheus histograms
+    bounds = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self._counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self._counts[bisect.bisect_left(self.bounds, value)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {}
+        total = 0
+        for bound, count in zip((*self.bounds, float('inf')), self._counts):
+            total += count
+            buckets[bound] = total
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class _RequestStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.duration = Histogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'count': self.count, 'errors': self.errors, 'bytes': self.bytes, 'duration': self.duration.as_dict()}
+
+
+class SessionStats:
+    # Built-in counters and histograms of a session, updated from its events
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests: dict[str, _RequestStats] = {}
+            self._retries = 0
+            self._decode_duration = Histogram()
+            self._catalog_hits = 0
+            self._catalog_misses = 0
+            self._saves = 0
+            self._skipped_saves = 0
+            self._save_duration = Histogram()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if event.name == 'request':
+                stats = self._requests.get(event.endpoint or '')
+                if stats is None:
+                    stats = self._requests[event.endpoint or ''] = _RequestStats()
+                stats.count += 1
+                stats.bytes += event.bytes or 0
+                if event.error or (event.status_code or 0) >= 400:
+                    stats.errors += 1
+                if event.duration is not None:
+                    stats.duration.observe(event.duration)
+            elif event.name == 'retry':
+                self._retries += 1
+            elif event.name == 'decode':
+                self._decode_duration.observe(event.duration or 0.0)
+            elif event.name == 'catalog':
+                if event.hit:
+                    self._catalog_hits += 1
+                else:
+                    self._catalog_misses += 1
+            elif event.name == 'save':
+                self._saves += 1
+                self._save_duration.observe(event.duration or 0.0)
+            elif event.name == 'save_skipped':
+                self._skipped_saves += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': {endpoint: x.as_dict() for endpoint, x in self._requests.items()},
+                'retries': self._retries,
+                'decode': {'tasks': self._decode_duration.count, 'duration': self._decode_duration.as_dict()},
+                'catalog_cache': {'hits': self._catalog_hits, 'misses': self._catalog_misses},
+                'saves': {
+                    'count': self._saves,
+                    'skipped': self._skipped_saves,
+                    'duration': self._save_duration.as_dict(),
+                },
+            }
+
+
+def call_hooks(hooks: list[Hook], event: Event) -> None:
+    # a failing hook must never break the request it observes
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception('pyrus-orm event hook %r failed', hook)
@@ -1,13 +1,15 @@
+import functools
 import sys
 from datetime import date, time, datetime, timezone
 from enum import Enum
-from typing import Literal, Optional, Generic, TypeVar, Union, TYPE_CHECKING, Type, cast, Any
+from typing import Literal, Optional, Generic, TypeVar, Union, TYPE_CHECKING, Type, cast, Any, NamedTuple
 
-from .catalog import CatalogItem, CatalogEmptyValue, _CatalogListWrapper
-from .session import get_session
+from .catalog import CatalogItem, CatalogEmptyValue
+from .session import get_session, peek_session
 from .types import Flag, Status
 
 if TYPE_CHECKING:
+    from .catalog import _CatalogListWrapper
     from .model import PyrusModel
 
 FieldType = Literal[
@@ -17,6 +19,8 @@ FieldType = Literal[
     'creation_date', 'note', 'catalog',
 ]
 
+ColumnType = Literal['object', 'float64', 'int64', 'bool', 'datetime64[D]', 'datetime64[s]']
+
 T = TypeVar('T')
 
 
@@ -24,6 +28,7 @@ class BaseField(Generic[T]):
     id: int
     name: Optional[str] = None
     type: FieldType
+    column_type: ColumnType = 'object'  # type of the field's column in columnar exports
 
     def __init__(self, id: int):
         self.id = id
@@ -35,11 +40,10 @@ class BaseField(Generic[T]):
         self.name = name
 
     def __get__(self, instance: 'PyrusModel', owner) -> Optional[T]:
-        return instance._field_values[self.id].get('value')
+        return instance._get_field_struct(self).get('value')
 
     def __set__(self, instance, value: T):
-        instance._field_values[self.id]['value'] = value
-        instance._changed_fields.add(self.id)
+        instance._set_field_value(self, value)
 
     @classmethod
     def deserialize_from_pyrus(cls, value: Any) -> T:
@@ -49,6 +53,25 @@ class BaseField(Generic[T]):
     def serialize_to_pyrus(cls, value: T) -> Any:
         return value
 
+    @classmethod
+    def pyrus_values_equal(cls, a: Any, b: Any) -> bool:
+        # compares two values in pyrus format
+        return cls.get_pyrus_scalar(a) == cls.get_pyrus_scalar(b)
+
+    @classmethod
+    def get_pyrus_scalar(cls, value: Any) -> Any:
+        # hashable, comparable form of a value in pyrus format (e.g. item_id for catalog values)
+        return value
+
+    @classmethod
+    def to_column_value(cls, value: Any) -> Any:
+        # converts a value in pyrus format to an element of the field's column
+        return None if value is None else cls.deserialize_from_pyrus(value)
+
+    def to_python_value(self, value: Any) -> Any:
+        # converts a value in pyrus format to the one model.as_dict() returns for the field
+        return None if value is None else self.deserialize_from_pyrus(value)
+
 
 class TextField(BaseField[str]):
     type = 'text'
@@ -56,6 +79,7 @@ class TextField(BaseField[str]):
 
 class NumericField(BaseField[float]):
     type = 'number'
+    column_type = 'float64'
 
     @classmethod
     def deserialize_from_pyrus(cls, value: Any) -> T:
@@ -64,6 +88,7 @@ class NumericField(BaseField[float]):
 
 class IntegerField(BaseField[int]):
     type = 'number'
+    column_type = 'int64'
 
     @classmethod
     def deserialize_from_pyrus(cls, value: Any) -> T:
@@ -72,6 +97,7 @@ class IntegerField(BaseField[int]):
 
 class DateField(BaseField[date]):
     type = 'date'
+    column_type = 'datetime64[D]'
 
     @classmethod
     def deserialize_from_pyrus(cls, value: Any) -> T:
@@ -96,6 +122,7 @@ class TimeField(BaseField[time]):
 
 class DueDateTimeField(BaseField[Optional[datetime]]):
     type = 'due_date_time'
+    column_type = 'datetime64[s]'
 
     @classmethod
     def deserialize_from_pyrus(cls, value: str) -> T:
@@ -114,6 +141,7 @@ class DueDateTimeField(BaseField[Optional[datetime]]):
 
 class StepField(BaseField[int]):
     type = 'step'
+    column_type = 'int64'
 
     def __set__(self, *_):
         raise AttributeError('step field is read-only')
@@ -139,17 +167,25 @@ class FlagField(BaseField[Flag]):
 
 class CheckmarkField(BaseField[bool]):
     type = 'checkmark'
+    column_type = 'bool'
 
     def __get__(self, instance: 'PyrusModel', owner) -> bool:
-        return instance._field_values[self.id].get('value') == 'checked'
+        return instance._get_field_struct(self).get('value') == 'checked'
 
     def __set__(self, instance, value: bool):
-        instance._field_values[self.id]['value'] = 'checked' if value else 'unchecked'
-        instance._changed_fields.add(self.id)
+        instance._set_field_value(self, 'checked' if value else 'unchecked')
+
+    @classmethod
+    def to_column_value(cls, value: Any) -> Any:
+        return value == 'checked'
+
+    def to_python_value(self, value: Any) -> Any:
+        return value == 'checked'
 
 
 class CatalogField(BaseField):
     type = 'catalog'
+    column_type = 'int64'  # item_id
     _catalog_id: int
 
     def __init__(self, id: int, *, catalog_id: int):
@@ -157,15 +193,42 @@ class CatalogField(BaseField):
         self._catalog_id = catalog_id
 
     def __get__(self, instance: 'PyrusModel', owner) -> Union[CatalogEmptyValue, CatalogItem]:
+        # The value is built once per model instance and cached until the field is set
         try:
-            field_value = instance._field_values[self.id]['value']
+            item = instance._field_cache.get(self.id)
+            if item is not None:
+                return item
+            field_value = instance._get_field_struct(self)['value']
         except (KeyError, AttributeError):
-            return CatalogEmptyValue(self._catalog_id)
+            item = CatalogEmptyValue(self._catalog_id)
+        else:
+            item = self._make_item(instance, field_value)
+
+        if instance is not None:
+            instance._field_cache[self.id] = item
+        return item
+
+    def _make_item(self, instance: 'PyrusModel', field_value: Any) -> CatalogItem:
+        bound_field_setter = functools.partial(self.__set__, instance)
+
+        # values of an item present in the session's cached catalog are shared with it, not copied
+        session = peek_session()
+        catalog = session.catalog_cache.peek(self._catalog_id) if session is not None else None
+        catalog_item = catalog.get_by_id(field_value['item_id']) if catalog is not None else None
+        if catalog_item is not None:
+            return CatalogItem(
+                item_id=catalog_item.item_id,
+                catalog_id=self._catalog_id,
+                headers=catalog_item.headers,
+                values_row=catalog_item.values_row,
+                values=catalog_item.values,
+                _bound_field_setter=bound_field_setter,
+            )
 
         return CatalogItem.from_pyrus_data(
             catalog_id=self._catalog_id,
             data=field_value,
-            bound_field_setter=lambda value: self.__set__(instance, value),
+            bound_field_setter=bound_field_setter,
         )
 
     def __set__(self, instance: 'PyrusModel', value: Union[CatalogItem, int]):
@@ -177,58 +240,136 @@ class CatalogField(BaseField):
             item_id = value
 
         # TODO: check if item_id is valid
-        instance._field_values[self.id]['value'] = {
+        instance._set_field_value(self, {
             'item_id': item_id
-        }
-        instance._changed_fields.add(self.id)
+        })
+
+    @classmethod
+    def get_pyrus_scalar(cls, value: Any) -> Any:
+        return value.get('item_id') if isinstance(value, dict) else value
+
+    @classmethod
+    def to_column_value(cls, value: Any) -> Any:
+        return cls.get_pyrus_scalar(value)
+
+    def to_python_value(self, value: Any) -> Any:
+        # values of the item, taken from the session's cached catalog when it's there
+        if not value:
+            return None
+        session = peek_session()
+        catalog = session.catalog_cache.peek(self._catalog_id) if session is not None else None
+        catalog_item = catalog.get_by_id(value['item_id']) if catalog is not None else None
+        if catalog_item is not None:
+            return dict(catalog_item.values)
+        if 'headers' in value and 'values' in value:
+            return dict(zip(value['headers'], value['values']))
+        return {}
 
 
 T_Enum = TypeVar('T_Enum', bound=Enum)
 
 
+class _EnumMapping(NamedTuple):
+    item_ids: dict[Enum, int]
+    members: dict[int, Enum]  # by item_id
+
+
 class CatalogEnumField(BaseField[T_Enum]):
     type = 'catalog'
+    column_type = 'int64'  # item_id
     _catalog_id: int
     _enum: Type[T_Enum]
     _id_field: str
+    _members_by_value: dict[Any, T_Enum]
 
     def __init__(self, id: int, *, catalog_id: int, enum: Type[T_Enum], id_field: str):
         super().__init__(id)
         self._catalog_id = catalog_id
         self._enum = enum
         self._id_field = id_field
+        self._members_by_value = {x.value: x for x in reversed(enum)}  # first member wins, as in a scan
 
     def __get__(self, instance: 'PyrusModel', owner) -> Optional[T_Enum]:
         try:
-            field_value = instance._field_values[self.id]['value']
+            field_value = instance._get_field_struct(self)['value']
         except (KeyError, AttributeError):
             return None
+        return self._get_member(field_value)
 
+    def _get_member(self, field_value: Any) -> T_Enum:
         if self._id_field == 'item_id':
             enum_value = field_value['item_id']
         else:
-            item_values = dict(zip(field_value['headers'], field_value['values']))
-            enum_value = item_values[self._id_field]
-
-        for item in self._enum:
-            if item.value == enum_value:
-                return item
-        raise ValueError(f"can't find enum item with value '{enum_value}'")
+            mapping = self._peek_mapping()
+            if mapping is not None:
+                member = mapping.members.get(field_value['item_id'])
+                if member is not None:
+                    return member
+            enum_value = field_value['values'][field_value['headers'].index(self._id_field)]
+
+        member = self._members_by_value.get(enum_value)
+        if member is None:
+            raise ValueError(f"can't find enum item with value '{enum_value}'")
+        return member
 
     def __set__(self, instance: 'PyrusModel', value: T_Enum):
         if self._id_field == 'item_id':
             item_id = value.value
         else:
-            catalog = _CatalogListWrapper(get_session().get_catalog(self._catalog_id))
-            item = catalog.find({self._id_field: value.value})
-            if item is None:
+            item_id = self._get_mapping().item_ids.get(value)
+            if item_id is None:
                 raise ValueError(f"can't find catalog item with field '{self._id_field}'='{value.value}'")
-            item_id = item.item_id
 
-        instance._field_values[self.id]['value'] = {
+        instance._set_field_value(self, {
             'item_id': item_id
-        }
-        instance._changed_fields.add(self.id)
+        })
+
+    def warmup(self) -> None:
+        # Loads the catalog and builds the mapping up front, failing if any enum member has no catalog item
+        catalog = get_session().get_catalog(self._catalog_id)
+        if self._id_field == 'item_id':
+            missing = [x for x in self._enum if catalog.get_by_id(x.value) is None]
+        else:
+            item_ids = self._get_mapping(catalog).item_ids
+            missing = [x for x in self._enum if x not in item_ids]
+
+        if missing:
+            raise ValueError(
+                f"catalog {self._catalog_id} has no items for {self._enum.__name__} members: "
+                f"{', '.join(x.name for x in missing)}"
+            )
+
+    def _get_mapping(self, catalog: Optional['_CatalogListWrapper'] = None) -> _EnumMapping:
+        if catalog is None:
+            catalog = get_session().get_catalog(self._catalog_id)
+        return catalog.get_derived((self._enum, self._id_field), self._build_mapping)
+
+    def _peek_mapping(self) -> Optional[_EnumMapping]:
+        # mapping of the session's cached catalog, never loads the catalog
+        session = peek_session()
+        catalog = session.catalog_cache.peek(self._catalog_id) if session is not None else None
+        return self._get_mapping(catalog) if catalog is not None else None
+
+    def _build_mapping(self, catalog: '_CatalogListWrapper') -> _EnumMapping:
+        item_ids: dict[Enum, int] = {}
+        members: dict[int, Enum] = {}
+        for item in catalog:
+            member = self._members_by_value.get(item.values.get(self._id_field))
+            if member is not None:
+                item_ids.setdefault(member, item.item_id)  # the first matching item, as find() returns
+                members[item.item_id] = member
+        return _EnumMapping(item_ids, members)
+
+    @classmethod
+    def get_pyrus_scalar(cls, value: Any) -> Any:
+        return value.get('item_id') if isinstance(value, dict) else value
+
+    @classmethod
+    def to_column_value(cls, value: Any) -> Any:
+        return cls.get_pyrus_scalar(value)
+
+    def to_python_value(self, value: Any) -> Any:
+        return None if value is None else self._get_member(value)
 
 
 class MultipleChoiceField(BaseField[set[T_Enum]]):
@@ -241,7 +382,7 @@ class MultipleChoiceField(BaseField[set[T_Enum]]):
 
     def __get__(self, instance: 'PyrusModel', owner) -> set[T_Enum]:
         try:
-            field_value = instance._field_values[self.id]['value']
+            field_value = instance._get_field_struct(self)['value']
         except (KeyError, AttributeError):
             return set()
 
@@ -250,7 +391,17 @@ class MultipleChoiceField(BaseField[set[T_Enum]]):
         return set(self._enum(x) for x in choice_ids)
 
     def __set__(self, instance: 'PyrusModel', value: set[T_Enum]):
-        instance._field_values[self.id]['value'] = {
+        instance._set_field_value(self, {
             'choice_ids': [x.value for x in value]
-        }
-        instance._changed_fields.add(self.id)
+        })
+
+    @classmethod
+    def get_pyrus_scalar(cls, value: Any) -> Any:
+        return tuple(sorted(value.get('choice_ids') or ())) if isinstance(value, dict) else value
+
+    @classmethod
+    def to_column_value(cls, value: Any) -> Any:
+        return None if value is None else list(value.get('choice_ids') or ())
+
+    def to_python_value(self, value: Any) -> Any:
+        return set() if value is None else set(self._enum(x) for x in value['choice_ids'])
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, TYPE_CHECKING, Type, TypeVar
+
+if TYPE_CHECKING:
+    from pyrus_orm.model import PyrusModel
+
+T = TypeVar('T', bound='PyrusModel')
+
+
+class IdentityMap:
+    """
+    Keeps a single model instance per task id, up to `maxsize` most recently used ones.
+
+    Models are considered current until task data with another last_modified_date is received.
+    Models with unsaved changes are never refreshed, so local edits are not lost.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._models: OrderedDict[int, PyrusModel] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, model_cls: Type[T], task_id: int) -> Optional[T]:
+        with self._lock:
+            model = self._models.get(task_id)
+            if model is None or type(model) is not model_cls:
+                return None
+            self._models.move_to_end(task_id)
+            return model
+
+    def get_or_load(self, model_cls: Type[T], data: dict[str, Any], lazy: bool = False, copy: bool = True) -> T:
+        # Returns cached model for the task data, updating it if the data is newer
+        with self._lock:
+            model = self.get(model_cls, data['id'])
+            if model is None:
+                model = model_cls.from_pyrus_data(data, lazy=lazy, copy=copy)
+                self.add(model)
+            elif _is_outdated(model, data):
+                model._load_pyrus_data(data, lazy=lazy, copy=copy)
+            return model
+
+    def update_from_data(self, data: dict[str, Any]) -> None:
+        # Refreshes cached model (if any) with task data received from pyrus
+        with self._lock:
+            model = self._models.get(data['id'])
+            if model is not None and _is_outdated(model, data):
+                model._load_pyrus_data(data, lazy=True)
+
+    def add(self, model: PyrusModel) -> None:
+        assert model.id, 'only saved models can be added'
+        with self._lock:
+            self._models[model.id] = model
+            self._models.move_to_end(model.id)
+            while len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+
+    def discard(self, task_id: int) -> None:
+        with self._lock:
+            self._models.pop(task_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def __contains__(self, task_id: int) -> bool:
+        with self._lock:
+            return task_id in self._models
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+
+def _get_last_modified_date(model: PyrusModel) -> Optional[str]:
+    return (model._data or {}).get('last_modified_date')
+
+
+def _is_outdated(model: PyrusModel, data: dict[str, Any]) -> bool:
+    # models being edited are kept as they are until saved
+    return not model._changed_fields and _get_last_modified_date(model) != data.get('last_modified_date')
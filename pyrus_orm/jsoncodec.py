@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class JSONCodec:
+    """
+    Decodes and encodes API payloads, from and to UTF-8 encoded JSON bytes.
+
+    This one uses the standard json module, OrjsonCodec and MsgspecCodec are faster on large payloads.
+    """
+
+    name = 'json'
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        # raises TypeError for values that are not plain JSON
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class OrjsonCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError('orjson is required for OrjsonCodec') from e
+        self.loads = orjson.loads
+        self.dumps = orjson.dumps
+
+
+class MsgspecCodec(JSONCodec):
+    name = 'msgspec'
+
+    def __init__(self):
+        try:
+            import msgspec
+        except ImportError as e:
+            raise ImportError('msgspec is required for MsgspecCodec') from e
+        self.loads = msgspec.json.Decoder().decode
+        self.dumps = msgspec.json.Encoder().encode
+
+
+def get_default_codec() -> JSONCodec:
+    # the fastest installed one: orjson, msgspec, or the standard json module
+    for codec_cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec_cls()
+        except ImportError:
+            pass
+    return JSONCodec()
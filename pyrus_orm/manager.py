@@ -1,9 +1,17 @@
-from typing import TypeVar, Type, Generic, Optional, Iterable
+import time
+from typing import TypeVar, Type, Generic, Optional, Iterable, Iterator, Any
 
 from pyrus.models.entities import EqualsFilter
 
+from .async_session import get_async_session
+from .bulk import BulkResult, run_bulk
 from .catalog import CatalogItem
-from .session import get_session
+from .columns import ColumnsFormat, decode_columns, decode_rows, to_arrow, to_numpy
+from .events import Event
+from .fields import CatalogEnumField, CatalogField
+from .query import QuerySet
+from .session import PyrusORMSession, get_session
+from .utils import flatten_fields
 
 T = TypeVar('T', bound='PyrusModel')
 
@@ -14,11 +22,40 @@ class Manager(Generic[T]):
     def __init__(self, model: Type[T]):
         self._model = model
 
-    def get(self, task_id: int) -> Optional[T]:
-        from pyrus_orm.session import get_session
+    def get(self, task_id: int, *, lazy: bool = False) -> Optional[T]:
+        session = get_session()
+        model = self._get_loaded(session, task_id)
+        if model is not None:
+            return model
 
-        data = get_session().get_task_raw(task_id)
-        return self._model.from_pyrus_data(data)
+        data = session.get_task_raw(task_id)
+        return self._load(session, data, lazy)
+
+    def all(self) -> QuerySet[T]:
+        return QuerySet(self._model)
+
+    def filter(self, **kwargs) -> QuerySet[T]:
+        return QuerySet(self._model).filter(**kwargs)
+
+    def get_many(
+        self,
+        task_ids: Iterable[int],
+        *,
+        concurrency: int = 8,
+        ordered: bool = True,
+        lazy: bool = False,
+    ) -> Iterator[BulkResult[int, T]]:
+        # Fetches tasks in parallel. Yields a result per task id (in task_ids order or as fetched),
+        # failed fetches are reported in the result's `error` and don't stop the others.
+        session = get_session()
+
+        def fetch(task_id: int) -> T:
+            model = self._get_loaded(session, task_id)
+            if model is not None:
+                return model
+            return self._load(session, session.get_task_raw(task_id), lazy)
+
+        return run_bulk(fetch, task_ids, concurrency=concurrency, ordered=ordered)
 
     def get_filtered(
         self,
@@ -26,8 +63,205 @@ class Manager(Generic[T]):
         include_archived: bool = False,
         steps: Iterable[int] = (),
         only: Iterable[str] = (),
+        lazy: bool = False,
+        join_catalogs: bool = False,
         **kwargs,
     ) -> list[T]:
+        # join_catalogs: values of catalog fields are taken from the session's catalogs by item_id
+        session = get_session()
+        only = tuple(only)
+        field_ids = self._get_field_ids(only)
+        tasks = session.get_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=self._make_filters(kwargs),
+            only=field_ids or None
+        )
+        if join_catalogs:
+            tasks = self._join_catalogs(session, tasks, only)
+        return [self._load(session, x, lazy, partial=bool(field_ids)) for x in tasks]
+
+    def iter_filtered(
+        self,
+        *,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        only: Iterable[str] = (),
+        lazy: bool = False,
+        join_catalogs: bool = False,
+        **kwargs,
+    ) -> Iterator[T]:
+        # Same as get_filtered(), but the register is streamed and models are built one at a time
+        session = get_session()
+        only = tuple(only)
+        field_ids = self._get_field_ids(only)
+        tasks = session.iter_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=self._make_filters(kwargs),
+            only=field_ids or None
+        )
+        if join_catalogs:
+            tasks = self._join_catalogs(session, tasks, only)
+        for task in tasks:
+            yield self._load(session, task, lazy, partial=bool(field_ids))
+
+    def to_columns(
+        self,
+        *field_names: str,
+        format: ColumnsFormat = 'python',
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> Any:
+        # Decodes the register straight into columns (dict of lists, numpy arrays or pyarrow Table),
+        # without building models. Task ids are always returned in 'id' column.
+        assert format in ('python', 'numpy', 'arrow'), f'unknown columns format {format}'
+        field_names = tuple(x for x in field_names if x != 'id') if field_names else tuple(self._model.Meta.fields)
+
+        tasks = get_session().iter_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=self._make_filters(kwargs),
+            only=self._get_projection(field_names),
+        )
+        columns = decode_columns(self._model, tasks, field_names)
+
+        if format == 'numpy':
+            return to_numpy(self._model, columns)
+        if format == 'arrow':
+            return to_arrow(self._model, columns)
+        return columns
+
+    def values(
+        self,
+        *field_names: str,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> list[dict[str, Any]]:
+        # Decodes only the requested fields of the register into dicts, no models are built.
+        # Values are the same as model.as_dict() returns, 'id' is the task id.
+        field_names = field_names or ('id', *self._model.Meta.fields)
+        rows = self._iter_rows(field_names, include_archived, steps, kwargs)
+        return [dict(zip(field_names, x)) for x in rows]
+
+    def values_list(
+        self,
+        *field_names: str,
+        flat: bool = False,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> list[Any]:
+        # Same as values(), but returns tuples, or single values if flat=True
+        assert not flat or len(field_names) == 1, 'flat=True requires a single field'
+        field_names = field_names or ('id', *self._model.Meta.fields)
+        rows = self._iter_rows(field_names, include_archived, steps, kwargs)
+        if flat:
+            return [x[0] for x in rows]
+        return list(rows)
+
+    def _iter_rows(
+        self,
+        field_names: tuple[str, ...],
+        include_archived: bool,
+        steps: Iterable[int],
+        kwargs: dict[str, Any],
+    ) -> Iterator[tuple[Any, ...]]:
+        tasks = get_session().iter_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=self._make_filters(kwargs),
+            only=self._get_projection(field_names),
+        )
+        return decode_rows(self._model, tasks, field_names)
+
+    async def aget(self, task_id: int, *, lazy: bool = False) -> Optional[T]:
+        session = get_async_session()
+        model = self._get_loaded(session, task_id)
+        if model is not None:
+            return model
+
+        data = await session.aget_task_raw(task_id)
+        return self._load(session, data, lazy)
+
+    async def afilter(
+        self,
+        *,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        only: Iterable[str] = (),
+        lazy: bool = False,
+        **kwargs,
+    ) -> list[T]:
+        # async counterpart of get_filtered()
+        session = get_async_session()
+        field_ids = self._get_field_ids(only)
+        tasks = await session.aget_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=include_archived,
+            steps=steps,
+            filters=self._make_filters(kwargs),
+            only=field_ids or None
+        )
+        return [self._load(session, x, lazy, partial=bool(field_ids)) for x in tasks]
+
+    def _get_loaded(self, session: PyrusORMSession, task_id: int) -> Optional[T]:
+        if session.identity_map is None:
+            return None
+        return session.identity_map.get(self._model, task_id)
+
+    def _load(self, session: PyrusORMSession, data: dict[str, Any], lazy: bool, partial: bool = False) -> T:
+        # Models built from partial (projected) data never go to the identity map.
+        # Task data comes straight from the session and is not used elsewhere, so it's not copied.
+        started = time.perf_counter()
+        if session.identity_map is None or partial:
+            model = self._model.from_pyrus_data(data, lazy=lazy, copy=False)
+        else:
+            model = session.identity_map.get_or_load(self._model, data, lazy=lazy, copy=False)
+
+        session.emit(Event(
+            'decode',
+            duration=time.perf_counter() - started,
+            form_id=self._model.Meta.form_id,
+            task_id=data.get('id'),
+        ))
+        return model
+
+    def _join_catalogs(
+        self,
+        session: PyrusORMSession,
+        tasks: Iterable[dict[str, Any]],
+        only: Iterable[str],
+    ) -> Iterator[dict[str, Any]]:
+        # Fills headers and values of catalog fields' items from the session's catalogs (each is loaded once).
+        # Items missing from the catalog keep the values received from pyrus.
+        only = set(only)
+        catalogs = {
+            field.id: session.get_catalog(field._catalog_id)
+            for name, field in self._model.Meta.fields.items()
+            if isinstance(field, (CatalogField, CatalogEnumField)) and (not only or name in only)
+        }
+
+        for task in tasks:
+            if catalogs:
+                structs = flatten_fields(task.get('fields', []))
+                for field_id, catalog in catalogs.items():
+                    struct = structs.get(field_id)
+                    value = struct.get('value') if struct is not None else None
+                    if not value:
+                        continue
+                    item = catalog.get_by_id(value.get('item_id'))
+                    if item is not None:
+                        struct['value'] = {**value, 'headers': item.headers, 'values': item.values_row}
+            yield task
+
+    def _make_filters(self, kwargs: dict[str, Any]) -> list[EqualsFilter]:
         fields = self._model.Meta.fields
 
         filters = []
@@ -41,18 +275,21 @@ class Manager(Generic[T]):
 
             filters.append(EqualsFilter(fields[k].id, value))
 
+        return filters
+
+    def _get_field_ids(self, only: Iterable[str]) -> list[int]:
         field_ids = []
         for field_name in only:
             field_ids.append(self._model.Meta.fields[field_name].id)
+        return field_ids
 
-        tasks = get_session().get_filtered_tasks(
-            self._model.Meta.form_id,
-            include_archived=include_archived,
-            steps=steps,
-            filters=filters,
-            only=field_ids or None
-        )
-        return [self._model.from_pyrus_data(x) for x in tasks]
+    def _get_projection(self, field_names: Iterable[str]) -> list[int]:
+        # field_ids for decoding the given fields and 'id' from the register
+        field_ids = self._get_field_ids(x for x in field_names if x != 'id')
+        if not field_ids and self._model._codec.sorted_fields:
+            # only task ids are requested, a single field keeps the register from returning all of them
+            field_ids = [self._model._codec.sorted_fields[0].id]
+        return field_ids
 
 
 class _ManagerProperty(Generic[T]):
@@ -1,13 +1,17 @@
-import copy
-import sys
+import time
 from datetime import datetime
-from typing import Any, TypeVar, Type, Optional, Generic
+from typing import Any, Callable, TypeVar, Type, Optional, Generic, Iterable
 
+from pyrus_orm.async_session import get_async_session
+from pyrus_orm.bulk import BulkResult, run_bulk
 from pyrus_orm.catalog import CatalogItem, CatalogEmptyValue
+from pyrus_orm.codec import ModelCodec, add_field_note, copy_json
+from pyrus_orm.events import Event
 from pyrus_orm.fields import BaseField
 from pyrus_orm.manager import Manager
-from pyrus_orm.session import get_session
-from pyrus_orm.utils import classproperty
+from pyrus_orm.scheduler import TokenBucket
+from pyrus_orm.session import PyrusORMSession, get_session
+from pyrus_orm.utils import classproperty, flatten_fields
 
 T = TypeVar('T', bound='PyrusModel')
 
@@ -19,7 +23,11 @@ class PyrusModel(Generic[T]):
 
     _data = None
     _field_values: dict[int, Any] = {}
+    _raw_field_values: dict[int, Any] = {}
+    _original_field_values: dict[int, Any] = {}
     _changed_fields: set[int]
+    _field_cache: dict[int, Any]  # values built by fields from their structs, dropped when the field is set
+    _codec: ModelCodec
 
     class Meta:
         form_id: int
@@ -37,17 +45,16 @@ class PyrusModel(Generic[T]):
         except (ValueError, AttributeError) as e:
             raise Exception('Model.Meta.form_id is not set') from e
 
+        cls._codec = ModelCodec(cls.__name__, getattr(cls.Meta, 'fields', {}))
+
     def __init__(self, **kwargs):
         self._field_values = {}
+        self._raw_field_values = {}
+        self._original_field_values = {}
         self._changed_fields = set()
+        self._field_cache = {}
         self.id = None
 
-        for field_name, field in self.Meta.fields.items():
-            if field.id not in self._field_values:
-                self._field_values[field.id] = {
-                    'id': field.id,
-                }
-
         for k, v in kwargs.items():
             if v is not None:
                 setattr(self, k, v)
@@ -56,8 +63,14 @@ class PyrusModel(Generic[T]):
     def from_pyrus_data(
         cls: Type[T],
         data: dict[str, Any],
+        lazy: bool = False,
+        copy: bool = True,
     ) -> T:
-        data = copy.deepcopy(data)
+        # In lazy mode the payload is not copied and fields are decoded on first access,
+        # so the caller must not modify `data` afterwards.
+        # copy=False skips the copy in eager mode too, for payloads nobody else holds (e.g. just received ones).
+        if not lazy and copy:
+            data = copy_json(data)
 
         def fix_datetime(v: str) -> str:
             # makes datetime compatible with python's 3.9 fromisoformat() function
@@ -67,42 +80,54 @@ class PyrusModel(Generic[T]):
         create_date = datetime.fromisoformat(fix_datetime(data['create_date']))
         last_modified_date = datetime.fromisoformat(fix_datetime(data['last_modified_date']))
 
-        fields = data.pop('fields')
-
-        # Flatten 'title' fields. Title is a field type which groups another fields inside.
-        flatten_fields = {}
-        for field in fields:
-            if field['type'] == 'title':  # TODO: check if title fields can be nested
-                flatten_fields.update({
-                    f['id']: f
-                    for f in field['value']['fields']
-                })
-            else:
-                flatten_fields[field['id']] = field
-
-        # Convert pyrus types to python
-        for name, field in cls.Meta.fields.items():
-            if field.id not in flatten_fields:
-                continue
+        fields = flatten_fields(data['fields'])
 
-            flatten_field = flatten_fields[field.id]
+        obj = cls()
+        obj.id = data['id']
+        obj._data = {k: v for k, v in data.items() if k != 'fields'}
+        obj._raw_field_values = fields
+        # raw structs are never modified, so they serve as a snapshot for change detection
+        obj._original_field_values = dict(fields)
+        obj.create_date = create_date
+        obj.last_modified_date = last_modified_date
+
+        if not lazy:
+            cls._codec.decode_fields(obj, obj._raw_field_values, obj._field_values)
+
+        return obj
 
-            if flatten_field.get('value') is not None:
+    def _get_field_struct(self, field: BaseField) -> dict[str, Any]:
+        # Returns field's value structure with python-typed 'value', decoding it from the raw pyrus data if needed
+        raw_struct = self._raw_field_values.pop(field.id, None)
+        if raw_struct is not None:
+            struct = dict(raw_struct)
+            if struct.get('value') is not None:
                 try:
-                    flatten_field['value'] = field.deserialize_from_pyrus(flatten_field['value'])
+                    struct['value'] = field.deserialize_from_pyrus(struct['value'])
                 except Exception as e:
-                    if sys.version_info >= (3, 11):
-                        e.add_note(f"Task id: {data.get('id')}, field struct: {flatten_field}")
-                    raise e
-
-        obj = cls(
-            id=data['id'],
-            _data=data,
-            _field_values=flatten_fields,
-            create_date=create_date,
-            last_modified_date=last_modified_date,
-        )
-        return obj
+                    add_field_note(e, self, raw_struct)
+                    raise
+            self._field_values[field.id] = struct
+            return struct
+
+        struct = self._field_values.get(field.id)
+        if struct is None:
+            struct = self._field_values[field.id] = {'id': field.id}
+        return struct
+
+    def _set_field_value(self, field: BaseField, value: Any) -> None:
+        # Sets python-typed value without decoding the previous one
+        raw_struct = self._raw_field_values.pop(field.id, None)
+        if raw_struct is not None:
+            struct = self._field_values[field.id] = dict(raw_struct)
+        else:
+            struct = self._field_values.get(field.id)
+            if struct is None:
+                struct = self._field_values[field.id] = {'id': field.id}
+
+        struct['value'] = value
+        self._changed_fields.add(field.id)
+        self._field_cache.pop(field.id, None)
 
     def as_pyrus_data(self):
         return {
@@ -113,50 +138,179 @@ class PyrusModel(Generic[T]):
 
     def get_pyrus_fields_data(self, changed_only: bool = False) -> list[Any]:
         # serialize values to pyrus format
+        # fields are encoded in id order
         values = []
-        for name, field in self.Meta.fields.items():
-            if 'value' not in self._field_values[field.id]:
+        for field, serialize in self._codec.encoders:
+            if changed_only and field.id not in self._changed_fields:
                 continue
-            value = self._field_values[field.id]['value']
-            try:
-                values.append({
-                    'id': field.id,
-                    'value': field.serialize_to_pyrus(value),
-                })
-            except Exception as e:
-                if sys.version_info >= (3, 11):
-                    e.add_note(f"Task id: {self.id}, field struct: {self._field_values[field.id]}")
-                raise e
-
-        if changed_only:
-            values = [x for x in values if x['id'] in self._changed_fields]
-
-        return sorted(values, key=lambda f: f['id'])
+
+            raw_struct = self._raw_field_values.get(field.id)
+            if raw_struct is not None:
+                # never decoded, so it's still in pyrus format
+                if 'value' in raw_struct:
+                    values.append({
+                        'id': field.id,
+                        'value': raw_struct['value'],
+                    })
+                continue
+
+            struct = self._field_values.get(field.id)
+            if struct is None or 'value' not in struct:
+                continue
+            value = struct['value']
+            if serialize is not None:
+                try:
+                    value = serialize(value)
+                except Exception as e:
+                    add_field_note(e, self, struct)
+                    raise
+
+            if changed_only and not self._is_field_value_changed(field, value):
+                continue
+
+            values.append({
+                'id': field.id,
+                'value': value,
+            })
+
+        return values
+
+    @classmethod
+    def _to_pyrus_value(cls, field_name: str, value: Any) -> Any:
+        # converts python value of the field to pyrus format the same way assignment to the field does
+        field = cls.Meta.fields[field_name]
+        if isinstance(value, CatalogItem):
+            return {'item_id': value.item_id}
+
+        model = cls()
+        try:
+            setattr(model, field_name, value)
+        except AttributeError:  # read-only fields
+            return field.serialize_to_pyrus(value)
+        return field.serialize_to_pyrus(model._get_field_struct(field)['value'])
+
+    def _is_field_value_changed(self, field: BaseField, value: Any) -> bool:
+        # compares serialized value with the one originally loaded from pyrus
+        original_struct = self._original_field_values.get(field.id)
+        if original_struct is None or 'value' not in original_struct:
+            return True
+        return not field.pyrus_values_equal(original_struct['value'], value)
+
+    def has_changes(self) -> bool:
+        return bool(self.get_pyrus_fields_data(changed_only=True))
 
     def as_dict(self) -> dict[str, Any]:
         values = {}
         for field_name in self.Meta.fields.keys():
             value = getattr(self, field_name)
             if isinstance(value, CatalogItem):
-                value = value.values
+                value = dict(value.values)  # values may be shared with the cached catalog
             elif isinstance(value, CatalogEmptyValue):
                 value = None
             values[field_name] = value
 
         return values
 
-    def save(self, comment: Optional[str] = None):
+    def save(self, comment: Optional[str] = None) -> None:
+        self._save(get_session(), comment)
+
+    @staticmethod
+    def save_many(
+        models: Iterable['PyrusModel'],
+        comment: Optional[str] = None,
+        *,
+        concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+    ) -> list[BulkResult['PyrusModel', None]]:
+        # Saves models in parallel. Unchanged models are skipped, a model passed several times is saved once.
+        # Returns a result per model in the same order.
+        # `rate_limit` paces the saves of this call only (e.g. to keep bulk writes slower than the rest),
+        # the session's scheduler limits all of its requests.
+        session = get_session()
+        bucket = TokenBucket(rate_limit) if rate_limit else None
+
+        def save(model: PyrusModel) -> bool:
+            return model._save(session, comment, before_request=bucket.acquire if bucket else None)
+
+        models = list(models)
+        unique_models = list({id(x): x for x in models}.values())
+        results = {
+            id(x.key): x
+            for x in run_bulk(save, unique_models, concurrency=concurrency)
+        }
+        return [
+            BulkResult(x, error=results[id(x)].error, skipped=results[id(x)].result is False)
+            for x in models
+        ]
+
+    def _save(
+        self,
+        session: PyrusORMSession,
+        comment: Optional[str],
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        # Returns False if the model had no changes to save
+        started = time.perf_counter()
+        field_updates = self._before_save(session)
+        if field_updates is None:
+            return False
+        if before_request is not None:
+            before_request()
         if self.id:
-            get_session().update_task(self.id, self.get_pyrus_fields_data(changed_only=True), comment)
+            data = session.update_task(self.id, field_updates, comment)
         else:
-            data = get_session().create_task(self.as_pyrus_data())
-            new_item = type(self).from_pyrus_data(data)
-            self.__dict__ = new_item.__dict__
+            data = session.create_task(self.as_pyrus_data())
+        self._after_save(session, data, started)
+        return True
+
+    def _before_save(self, session: PyrusORMSession) -> Optional[list[Any]]:
+        # Returns field updates of an existing task (empty for a new one), None if there is nothing to save
+        if not self.id:
+            return []
+        field_updates = self.get_pyrus_fields_data(changed_only=True)
+        if not field_updates:
+            # nothing has actually changed
+            self._changed_fields.clear()
+            session.emit(Event('save_skipped', form_id=self.Meta.form_id, task_id=self.id))
+            return None
+        return field_updates
+
+    def _after_save(self, session: PyrusORMSession, data: dict[str, Any], started: float) -> None:
+        self._load_pyrus_data(data, lazy=True)
+        if session.identity_map is not None:
+            session.identity_map.add(self)
+        session.emit(Event(
+            'save',
+            duration=time.perf_counter() - started,
+            form_id=self.Meta.form_id,
+            task_id=self.id,
+        ))
+
+    def _load_pyrus_data(self, data: dict[str, Any], lazy: bool = False, copy: bool = True) -> None:
+        # replaces model's state with the task data received from pyrus
+        new_item = type(self).from_pyrus_data(data, lazy=lazy, copy=copy)
+        self.__dict__ = new_item.__dict__
 
     def comment(self, comment: str) -> None:
         assert self.id
         get_session().comment_task(self.id, comment)
 
+    async def asave(self, comment: Optional[str] = None) -> None:
+        session = get_async_session()
+        started = time.perf_counter()
+        field_updates = self._before_save(session)
+        if field_updates is None:
+            return
+        if self.id:
+            data = await session.aupdate_task(self.id, field_updates, comment)
+        else:
+            data = await session.acreate_task(self.as_pyrus_data())
+        self._after_save(session, data, started)
+
+    async def acomment(self, comment: str) -> None:
+        assert self.id
+        await get_async_session().acomment_task(self.id, comment)
+
     def get_url(self) -> str:
         return f'https://pyrus.com/t#id{self.id}'
 
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Generic, Iterator, Optional, Type, TypeVar, TYPE_CHECKING
+
+from pyrus.models.entities import (
+    EqualsFilter, ExistsFilter, FormRegisterFilter, GreaterThanFilter, IsEmptyFilter, IsInFilter,
+    LessThanFilter, RangeFilter,
+)
+
+from .catalog import CatalogEmptyValue, CatalogItem
+from .fields import CatalogEnumField, CatalogField, MultipleChoiceField
+from .session import get_session
+
+if TYPE_CHECKING:
+    from .model import PyrusModel
+
+T = TypeVar('T', bound='PyrusModel')
+
+
+def _contains(a: Any, b: Any) -> bool:
+    return a is not None and b in a
+
+
+def _icontains(a: Any, b: Any) -> bool:
+    return a is not None and b.lower() in a.lower()
+
+
+def _in(a: Any, b: list[Any]) -> bool:
+    if isinstance(a, (set, frozenset)):  # multiple choice: any of the choices
+        return any(x in a for x in b)
+    return a in b
+
+
+def _range(a: Any, b: tuple[Any, Any]) -> bool:
+    return a is not None and b[0] <= a <= b[1]
+
+
+def _widen_range(bounds: tuple[Any, Any]) -> Optional[tuple[Any, Any]]:
+    # Register ranges exclude their bounds, so an inclusive range is sent widened by a step and re-checked
+    # client-side. None if there is no such step for the values.
+    low, high = bounds
+    if all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in bounds):
+        return low - 1, high + 1
+    if all(isinstance(x, date) and not isinstance(x, datetime) for x in bounds):
+        return low - timedelta(days=1), high + timedelta(days=1)
+    return None
+
+
+def _ordering(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def compare(a: Any, b: Any) -> bool:
+        return a is not None and op(a, b)
+    return compare
+
+
+# lookup -> client-side check of a model's value
+_LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+    'exact': operator.eq,
+    'ne': operator.ne,
+    'gt': _ordering(operator.gt),
+    'gte': _ordering(operator.ge),
+    'lt': _ordering(operator.lt),
+    'lte': _ordering(operator.le),
+    'range': _range,
+    'in': _in,
+    'isnull': lambda a, b: (a is None) == b,
+    'contains': _contains,
+    'icontains': _icontains,
+}
+
+
+@dataclass(frozen=True)
+class _Lookup:
+    field_name: str
+    lookup: str
+    value: Any
+
+
+class QuerySet(Generic[T]):
+    """
+    Lazy, chainable query over a form register.
+
+    Lookups supported by the register (exact, gt, lt, range, isnull, in for catalog and multiple choice fields;
+    one per field) are sent to Pyrus, the rest are checked client-side while the response is streamed.
+    gt and lt follow the Pyrus register semantics, range includes both bounds (the register range is widened
+    and the result is checked client-side).
+    Models are decoded lazily.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        lookups: tuple[_Lookup, ...] = (),
+        only: tuple[str, ...] = (),
+        include_archived: bool = False,
+        steps: tuple[int, ...] = (),
+    ):
+        self._model = model
+        self._lookups = lookups
+        self._only = only
+        self._include_archived = include_archived
+        self._steps = steps
+
+    def filter(self, **kwargs) -> QuerySet[T]:
+        lookups = []
+        for key, value in kwargs.items():
+            field_name, _, lookup = key.partition('__')
+            lookup = lookup or 'exact'
+            assert field_name in self._model.Meta.fields, f'field {field_name} not found in model fields'
+            assert lookup in _LOOKUPS, f'unsupported lookup {lookup}'
+            if lookup == 'range':
+                assert len(value) == 2, 'range lookup requires two values'
+            lookups.append(_Lookup(field_name, lookup, value))
+
+        return self._clone(lookups=self._lookups + tuple(lookups))
+
+    def only(self, *field_names: str) -> QuerySet[T]:
+        for field_name in field_names:
+            assert field_name in self._model.Meta.fields, f'field {field_name} not found in model fields'
+        return self._clone(only=self._only + field_names)
+
+    def include_archived(self, include: bool = True) -> QuerySet[T]:
+        return self._clone(include_archived=include)
+
+    def steps(self, *steps: int) -> QuerySet[T]:
+        return self._clone(steps=steps)
+
+    def first(self) -> Optional[T]:
+        for item in self:
+            return item
+        return None
+
+    def count(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[T]:
+        from .manager import Manager
+
+        server_filters, client_lookups = self._split_lookups()
+
+        field_ids = []
+        if self._only:
+            field_names = dict.fromkeys([*self._only, *(x.field_name for x in client_lookups)])
+            field_ids = [self._model.Meta.fields[x].id for x in field_names]
+
+        session = get_session()
+        manager = Manager(self._model)
+        tasks = session.iter_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=self._include_archived,
+            steps=self._steps,
+            filters=server_filters,
+            only=field_ids or None,
+        )
+        for task in tasks:
+            model = manager._load(session, task, lazy=True, partial=bool(field_ids))
+            if all(self._check(model, x) for x in client_lookups):
+                yield model
+
+    def __repr__(self) -> str:
+        return f'<QuerySet {self._model.__name__} {list(self._lookups)}>'
+
+    def _clone(self, **kwargs) -> QuerySet[T]:
+        params = {
+            'lookups': self._lookups,
+            'only': self._only,
+            'include_archived': self._include_archived,
+            'steps': self._steps,
+            **kwargs,
+        }
+        return type(self)(self._model, **params)
+
+    def _split_lookups(self) -> tuple[list[FormRegisterFilter], list[_Lookup]]:
+        server_filters = []
+        client_lookups = []
+        filtered_fields = set()
+
+        for lookup in self._lookups:
+            register_filter = None
+            if lookup.field_name not in filtered_fields:  # register accepts a single filter per field
+                register_filter = self._make_register_filter(lookup)
+
+            if register_filter is None or lookup.lookup == 'range':
+                client_lookups.append(lookup)
+            if register_filter is not None:
+                server_filters.append(register_filter)
+                filtered_fields.add(lookup.field_name)
+
+        return server_filters, client_lookups
+
+    def _make_register_filter(self, lookup: _Lookup) -> Optional[FormRegisterFilter]:
+        field = self._model.Meta.fields[lookup.field_name]
+
+        def to_pyrus(value: Any) -> Any:
+            return field.get_pyrus_scalar(self._model._to_pyrus_value(lookup.field_name, value))
+
+        if lookup.lookup == 'isnull':
+            return IsEmptyFilter(field.id) if lookup.value else ExistsFilter(field.id)
+        if lookup.lookup == 'in':
+            if isinstance(field, (CatalogField, CatalogEnumField)):
+                return IsInFilter(field.id, [to_pyrus(x) for x in lookup.value])
+            if isinstance(field, MultipleChoiceField):
+                return IsInFilter(field.id, [x.value for x in lookup.value])
+            return None
+        if isinstance(field, MultipleChoiceField):
+            return None
+        if lookup.lookup == 'exact' and lookup.value is not None:
+            return EqualsFilter(field.id, to_pyrus(lookup.value))
+        if lookup.lookup == 'gt':
+            return GreaterThanFilter(field.id, to_pyrus(lookup.value))
+        if lookup.lookup == 'lt':
+            return LessThanFilter(field.id, to_pyrus(lookup.value))
+        if lookup.lookup == 'range':
+            bounds = _widen_range(tuple(lookup.value))
+            return RangeFilter(field.id, [to_pyrus(x) for x in bounds]) if bounds is not None else None
+        return None
+
+    @staticmethod
+    def _check(model: PyrusModel, lookup: _Lookup) -> bool:
+        value = _comparable(getattr(model, lookup.field_name))
+        expected = lookup.value
+        if lookup.lookup in ('in', 'range'):
+            expected = [_comparable(x) for x in expected]
+        elif lookup.lookup != 'isnull':
+            expected = _comparable(expected)
+        return _LOOKUPS[lookup.lookup](value, expected)
+
+
+def _comparable(value: Any) -> Any:
+    # catalog values are compared by item_id
+    if isinstance(value, CatalogItem):
+        return value.item_id
+    if isinstance(value, CatalogEmptyValue):
+        return None
+    return value
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Generic, Iterable, Iterator, Optional, Type, TypeVar, TYPE_CHECKING
+
+from .fields import BaseField
+from .session import get_session
+from .utils import flatten_fields
+
+if TYPE_CHECKING:
+    from .model import PyrusModel
+
+T = TypeVar('T', bound='PyrusModel')
+
+
+class FormReplica(Generic[T]):
+    """
+    Local SQLite copy of a form register.
+
+    Every task is stored as JSON together with one column per model field (catalog values are stored as item_id),
+    so queries run locally. sync() downloads only tasks modified since the previous sync.
+    Deleted tasks can be detected by a full sync only.
+    """
+
+    sync_batch_size = 500
+
+    def __init__(self, model: Type[T], path: str = ':memory:'):
+        self._model = model
+        self._table = f'form_{int(model.Meta.form_id)}'
+        self._fields: dict[str, BaseField] = dict(model.Meta.fields)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_table()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> FormReplica[T]:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def sync(self, *, full: bool = False) -> int:
+        # Returns number of tasks received from pyrus
+        modified_after = None if full else self._get_modified_after()
+
+        tasks = get_session().iter_filtered_tasks(
+            self._model.Meta.form_id,
+            include_archived=True,
+            modified_after=modified_after,
+        )
+
+        count = 0
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute(f'DELETE FROM "{self._table}"')
+
+            batch = []
+            for task in tasks:
+                batch.append(self._make_row(task))
+                if len(batch) >= self.sync_batch_size:
+                    self._insert_rows(batch)
+                    count += len(batch)
+                    batch = []
+
+            self._insert_rows(batch)
+            count += len(batch)
+
+        return count
+
+    def get(self, task_id: int) -> Optional[T]:
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT data FROM "{self._table}" WHERE task_id = ?',
+                (task_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return self._model.from_pyrus_data(json.loads(row[0]), lazy=True)
+
+    def get_filtered(
+        self,
+        *,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> list[T]:
+        return list(self.iter_filtered(include_archived=include_archived, steps=steps, **kwargs))
+
+    def iter_filtered(
+        self,
+        *,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> Iterator[T]:
+        where, params = self._make_where(include_archived, steps, kwargs)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT data FROM "{self._table}" WHERE {where} ORDER BY task_id',
+                params,
+            ).fetchall()
+
+        for row in rows:
+            yield self._model.from_pyrus_data(json.loads(row[0]), lazy=True)
+
+    def count(
+        self,
+        *,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        **kwargs,
+    ) -> int:
+        where, params = self._make_where(include_archived, steps, kwargs)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM "{self._table}" WHERE {where}', params).fetchone()[0]
+
+    def _create_table(self) -> None:
+        columns = ''.join(f', "f_{name}"' for name in self._fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self._table}" ('
+                f'task_id INTEGER PRIMARY KEY, create_date TEXT, last_modified_date TEXT, '
+                f'close_date TEXT, current_step INTEGER, data TEXT NOT NULL{columns})'
+            )
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "{self._table}_last_modified_date" '
+                f'ON "{self._table}" (last_modified_date)'
+            )
+
+            # add columns for fields declared after the table was created
+            existing = {row[1] for row in self._conn.execute(f'PRAGMA table_info("{self._table}")')}
+            for name in self._fields:
+                if f'f_{name}' not in existing:
+                    self._conn.execute(f'ALTER TABLE "{self._table}" ADD COLUMN "f_{name}"')
+
+    def _get_modified_after(self) -> Optional[datetime]:
+        with self._lock:
+            value = self._conn.execute(f'SELECT MAX(last_modified_date) FROM "{self._table}"').fetchone()[0]
+        if not value:
+            return None
+
+        # pyrus dates have seconds precision, overlap by a second to not miss tasks modified at the same moment
+        return datetime.fromisoformat(value.replace('Z', '+00:00')) - timedelta(seconds=1)
+
+    def _make_row(self, task: dict[str, Any]) -> tuple[Any, ...]:
+        raw_values = {
+            field_id: field.get('value')
+            for field_id, field in flatten_fields(task.get('fields', [])).items()
+        }
+
+        return (
+            task['id'],
+            task.get('create_date'),
+            task.get('last_modified_date'),
+            task.get('close_date'),
+            task.get('current_step'),
+            json.dumps(task, ensure_ascii=False),
+            *(self._to_column_value(field, raw_values.get(field.id)) for field in self._fields.values()),
+        )
+
+    def _insert_rows(self, rows: list[tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        columns = ''.join(f', "f_{name}"' for name in self._fields)
+        placeholders = ', '.join('?' * len(rows[0]))
+        self._conn.executemany(
+            f'INSERT OR REPLACE INTO "{self._table}" '
+            f'(task_id, create_date, last_modified_date, close_date, current_step, data{columns}) '
+            f'VALUES ({placeholders})',
+            rows,
+        )
+
+    def _make_where(
+        self,
+        include_archived: bool,
+        steps: Iterable[int],
+        kwargs: dict[str, Any],
+    ) -> tuple[str, list[Any]]:
+        conditions = ['1']
+        params: list[Any] = []
+
+        if not include_archived:
+            conditions.append('close_date IS NULL')
+
+        steps = list(steps)
+        if steps:
+            conditions.append(f'current_step IN ({", ".join("?" * len(steps))})')
+            params.extend(steps)
+
+        for k, v in kwargs.items():
+            assert k in self._fields, f'field {k} not found in model fields'
+            conditions.append(f'"f_{k}" = ?')
+            params.append(self._to_column_value(self._fields[k], self._model._to_pyrus_value(k, v)))
+
+        return ' AND '.join(conditions), params
+
+    @staticmethod
+    def _to_column_value(field: BaseField, value: Any) -> Any:
+        if value is None:
+            return None
+        value = field.get_pyrus_scalar(value)
+        if isinstance(value, (dict, list, tuple)):
+            return json.dumps(value, ensure_ascii=False)
+        return value
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+from .errors import PyrusConnectionError
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    # Allows `rate` acquisitions per second on average and bursts of up to `burst`, shared by all threads
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        assert rate > 0, 'rate must be positive'
+        assert burst >= 1, 'burst must be at least 1'
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # the token is taken in advance, a negative balance makes later callers wait longer
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if delay:
+            self._sleep(delay)
+
+
+class RequestScheduler:
+    """
+    Paces and retries the requests of a session.
+
+    All requests share a token bucket (`rate` requests per second with bursts of up to `burst`, unlimited by default).
+    A throttled response (429) pauses every request of the session for Retry-After seconds.
+    Server errors and connection failures are retried for idempotent requests only,
+    with exponential backoff and full jitter, at most `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = None,
+        burst: int = 10,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._bucket = TokenBucket(rate, burst, clock=clock, sleep=sleep) if rate else None
+        self._clock = clock
+        self._sleep = sleep
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        send: Callable[[], requests.Response],
+        *,
+        idempotent: bool,
+        on_retry: Optional[Callable[[float, Optional[int], Optional[BaseException]], None]] = None,
+    ) -> requests.Response:
+        # Returns the first successful response, or the last failed one when retries are over.
+        # on_retry(delay, status_code, error) is called before every retry.
+        attempt = 0
+        while True:
+            self._wait_pause()
+            if self._bucket is not None:
+                self._bucket.acquire()
+
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise PyrusConnectionError(str(e)) from e
+                delay = self._get_backoff(attempt)
+                logger.info('request failed (%s), retrying in %.2fs', e, delay)
+                if on_retry is not None:
+                    on_retry(delay, None, e)
+            else:
+                status = response.status_code
+                if status not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                    return response
+                if status != 429 and not idempotent:
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if status == 429 and retry_after is not None:
+                    self._pause(retry_after)
+                delay = retry_after if retry_after is not None else self._get_backoff(attempt)
+                response.close()
+                logger.info('pyrus api responded with %s, retrying in %.2fs', status, delay)
+                if on_retry is not None:
+                    on_retry(delay, status, None)
+
+            self._sleep(delay)
+            attempt += 1
+
+    def _get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _wait_pause(self) -> None:
+        delay = self._paused_until - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
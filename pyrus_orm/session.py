@@ -1,75 +1,202 @@
 from __future__ import annotations
 
 import contextlib
-from functools import lru_cache
-from typing import Any, Optional, TYPE_CHECKING, Iterable
+import contextvars
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional, TYPE_CHECKING, Iterable, Iterator, Type
 
-from pyrus.models.requests import FormRegisterRequest, TaskCommentRequest
+import requests
+from pyrus.models.requests import FormRegisterRequest
+
+from .bulk import BulkResult, run_bulk
+from .cache import CatalogCache
+from .errors import PyrusAPIError, PyrusAuthError, make_api_error
+from .events import Event, Hook, SessionStats, call_hooks
+from .identity_map import IdentityMap
+from .jsoncodec import JSONCodec, get_default_codec
+from .scheduler import RequestScheduler, parse_retry_after
+from .snapshot import CatalogSnapshotStore
+from .streaming import iter_json_array
+from .transport import HTTPTransport, Timeout, Transport
 
 if TYPE_CHECKING:
     from pyrus import PyrusAPI
     from pyrus.models.entities import FormRegisterFilter
+    from pyrus_orm.catalog import _CatalogListWrapper
+    from pyrus_orm.model import PyrusModel
+
+logger = logging.getLogger(__name__)
 
 
 class PyrusORMSession:
-    def __init__(self, pyrus_api: PyrusAPI):
+    """
+    Access to Pyrus API with catalog cache and connection pool.
+
+    A session is thread-safe and can be shared by threads and asyncio tasks, or each of them can use its own one.
+    """
+
+    stream_chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        pyrus_api: PyrusAPI,
+        catalog_cache: Optional[CatalogCache] = None,
+        catalog_snapshot: Optional[CatalogSnapshotStore] = None,
+        identity_map: Optional[IdentityMap] = None,
+        transport: Optional[Transport] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        hooks: Iterable[Hook] = (),
+        json_codec: Optional[JSONCodec] = None,
+    ):
         self.pyrus_api = pyrus_api
+        self.json_codec = json_codec if json_codec is not None else get_default_codec()
+        self.transport = transport if transport is not None else HTTPTransport(proxies=pyrus_api.proxy)
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.catalog_cache = catalog_cache if catalog_cache is not None else CatalogCache()
+        self.catalog_snapshot = catalog_snapshot
+        self.identity_map = identity_map
+        self.hooks: list[Hook] = list(hooks)
+        self._stats = SessionStats()
+        self._snapshot_checked: set[int] = set()
+        self._lock = threading.Lock()
+        self._auth_lock = threading.Lock()
+
+    def add_hook(self, hook: Hook) -> None:
+        # the list is replaced, not modified, so events emitted concurrently are never affected
+        with self._lock:
+            self.hooks = [*self.hooks, hook]
+
+    def remove_hook(self, hook: Hook) -> None:
+        with self._lock:
+            hooks = list(self.hooks)
+            hooks.remove(hook)
+            self.hooks = hooks
+
+    def emit(self, event: Event) -> None:
+        self._stats(event)
+        if self.hooks:
+            call_hooks(self.hooks, event)
+
+    def stats(self, reset: bool = False) -> dict[str, Any]:
+        # Counters and duration histograms collected since the session was created (or the last reset)
+        stats = self._stats.as_dict()
+        if reset:
+            self._stats.reset()
+        return stats
+
+    def get_catalog(self, catalog_id: int) -> _CatalogListWrapper:
+        missed = False
+
+        def load(catalog_id: int) -> _CatalogListWrapper:
+            nonlocal missed
+            missed = True
+            return self._load_catalog(catalog_id)
+
+        started = time.perf_counter()
+        catalog = self.catalog_cache.get(catalog_id, load)
+        self.emit(Event('catalog', duration=time.perf_counter() - started, catalog_id=catalog_id, hit=not missed))
+        return catalog
+
+    def prefetch_catalogs(
+        self,
+        *models: Type[PyrusModel],
+        concurrency: int = 8,
+    ) -> list[BulkResult[int, _CatalogListWrapper]]:
+        # Loads catalogs of all catalog fields of the models into the cache concurrently (e.g. at startup).
+        # Returns a result per catalog id, failures are reported in the result's `error`.
+        from pyrus_orm.fields import CatalogEnumField, CatalogField
+
+        catalog_ids = dict.fromkeys(
+            field._catalog_id
+            for model in models
+            for field in model.Meta.fields.values()
+            if isinstance(field, (CatalogField, CatalogEnumField))
+        )
+        return list(run_bulk(self.get_catalog, catalog_ids, concurrency=concurrency))
+
+    def _load_catalog(self, catalog_id: int) -> _CatalogListWrapper:
+        # Snapshot is used only the first time a catalog is needed, later loads (refreshes) go to the API
+        if self.catalog_snapshot is not None and self._check_snapshot_once(catalog_id):
+            rows = self.catalog_snapshot.load(catalog_id)
+            if rows is not None:
+                return self._make_catalog(catalog_id, *rows)
+
+        headers, items = self._fetch_catalog(catalog_id)
+        if self.catalog_snapshot is not None:
+            try:
+                self.catalog_snapshot.save(catalog_id, headers, items)
+            except OSError:
+                logger.warning('failed to save catalog %s snapshot', catalog_id, exc_info=True)
+
+        return self._make_catalog(catalog_id, headers, items)
+
+    def _check_snapshot_once(self, catalog_id: int) -> bool:
+        with self._lock:
+            if catalog_id in self._snapshot_checked:
+                return False
+            self._snapshot_checked.add(catalog_id)
+            return True
 
-    @lru_cache(maxsize=512)
-    def get_catalog(self, catalog_id: int):
-        from pyrus_orm.catalog import CatalogItem
+    def _fetch_catalog(self, catalog_id: int) -> tuple[list[str], list[tuple[int, list[str]]]]:
+        response = self._request_json('GET', f'/catalogs/{catalog_id}')
 
-        catalog = self.pyrus_api.get_catalog(catalog_id)
-        headers = [x.name for x in catalog.catalog_headers]
-        return [
+        headers = [x['name'] for x in response.get('catalog_headers', [])]
+        return headers, [(item['item_id'], item['values']) for item in response.get('items', [])]
+
+    def _make_catalog(
+        self,
+        catalog_id: int,
+        headers: list[str],
+        items: list[tuple[int, list[str]]],
+    ) -> _CatalogListWrapper:
+        from pyrus_orm.catalog import CatalogItem, _CatalogListWrapper
+
+        return _CatalogListWrapper(
             CatalogItem(
-                item_id=item.item_id,
+                item_id=item_id,
                 catalog_id=catalog_id,
                 headers=headers,
-                values_row=item.values,
-                values=dict(zip(headers, item.values))
+                values_row=values,
+                values=dict(zip(headers, values))
             )
-            for item in catalog.items
-        ]
-
-    def get_task_raw(self, task_id: int) -> dict[str, Any]:
-        response = self.pyrus_api._perform_get_request(
-            self.pyrus_api._create_url(f'/tasks/{task_id}')
+            for item_id, values in items
         )
-        if 'error' in response:
-            raise Exception(response['error'])  # TODO: proper error handling
 
+    def get_task_raw(self, task_id: int) -> dict[str, Any]:
+        response = self._request_json('GET', f'/tasks/{task_id}')
         if not response.get('task'):
-            raise Exception('no task received')
+            raise PyrusAPIError('no task received')
 
         return response['task']
 
-    def update_task(self, task_id: int, field_updates: list[Any], comment: Optional[str] = None) -> None:
-        response = self.pyrus_api._perform_post_request(
-            self.pyrus_api._create_url(f'/tasks/{task_id}/comments'),
+    def update_task(self, task_id: int, field_updates: list[Any], comment: Optional[str] = None) -> dict[str, Any]:
+        response = self._request_json(
+            'POST',
+            f'/tasks/{task_id}/comments',
             {
                 'text': comment,
                 'field_updates': field_updates,
             }
         )
-        if 'error' in response:
-            raise Exception(response['error'])  # TODO: proper error handling
-
         if not response.get('task'):
-            raise Exception('no task received')
+            raise PyrusAPIError('no task received')
+
+        if self.identity_map is not None:
+            self.identity_map.update_from_data(response['task'])
 
         return response['task']
 
     def create_task(self, data: dict[str, Any]) -> dict[str, Any]:
-        response = self.pyrus_api._perform_post_request(
-            self.pyrus_api._create_url(f'/tasks'),
-            data
-        )
-        if 'error' in response:
-            raise Exception(response['error'])  # TODO: proper error handling
-
+        response = self._request_json('POST', '/tasks', data)
         if not response.get('task'):
-            raise Exception('no task received')
+            raise PyrusAPIError('no task received')
+
+        if self.identity_map is not None:
+            self.identity_map.update_from_data(response['task'])
 
         return response['task']
 
@@ -80,48 +207,249 @@ class PyrusORMSession:
         steps: Iterable[int] = (),
         filters: Iterable[FormRegisterFilter] = (),
         only: Iterable[int] = (),
+        modified_after: Optional[datetime] = None,
     ):
+        request = self._make_register_request(include_archived, steps, filters, only, modified_after)
+
+        response = self._request_json('POST', f'/forms/{form_id}/register', request, idempotent=True, form_id=form_id)
+
+        return response.get('tasks', [])
+
+    def iter_filtered_tasks(
+        self,
+        form_id: int,
+        include_archived: bool = False,
+        steps: Iterable[int] = (),
+        filters: Iterable[FormRegisterFilter] = (),
+        only: Iterable[int] = (),
+        modified_after: Optional[datetime] = None,
+    ) -> Iterator[dict[str, Any]]:
+        # Same as get_filtered_tasks(), but parses the response incrementally
+        request = self._make_register_request(include_archived, steps, filters, only, modified_after)
+
+        path = f'/forms/{form_id}/register'
+        started = time.perf_counter()
+        status_code = None
+        size = 0
+        task_count = 0
+        error = None
+
+        def count_bytes(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            nonlocal size
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+
+        try:
+            response = self._request('POST', path, request, stream=True, idempotent=True)
+            status_code = response.status_code
+            with response:
+                self._raise_for_error(response)
+                other_values: dict[str, Any] = {}
+                for task in iter_json_array(
+                    count_bytes(response.iter_content(chunk_size=self.stream_chunk_size)),
+                    'tasks',
+                    other_values,
+                ):
+                    task_count += 1
+                    yield task
+
+            if 'error' in other_values:
+                raise make_api_error(response.status_code, other_values)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.emit(Event(
+                'request',
+                duration=time.perf_counter() - started,
+                endpoint=_get_endpoint('POST', path),
+                status_code=status_code,
+                bytes=size,
+                form_id=form_id,
+                task_count=task_count,
+                error=error,
+            ))
+
+    def _make_register_request(
+        self,
+        include_archived: bool,
+        steps: Iterable[int],
+        filters: Iterable[FormRegisterFilter],
+        only: Iterable[int],
+        modified_after: Optional[datetime] = None,
+    ) -> FormRegisterRequest:
         request = FormRegisterRequest(
             include_archived=include_archived,
             steps=list(steps),
             filters=filters,
+            modified_after=modified_after,
         )
         if only:
             request.field_ids = only
+        return request
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        *,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+        idempotent: Optional[bool] = None,
+    ) -> requests.Response:
+        # Authorized API request through the session transport and scheduler, token is refreshed once on 401.
+        # Only idempotent requests (GET by default) are retried after server and connection errors.
+        api = self.pyrus_api
+        data = self._encode_body(body) if body is not None else None
+        if idempotent is None:
+            idempotent = method == 'GET'
 
+        def on_retry(delay: float, status_code: Optional[int], error: Optional[BaseException]) -> None:
+            self.emit(Event(
+                'retry',
+                duration=delay,
+                endpoint=_get_endpoint(method, path),
+                status_code=status_code,
+                error=type(error).__name__ if error is not None else None,
+            ))
 
-        response = self.pyrus_api._perform_post_request(
-            self.pyrus_api._create_url(f'/forms/{form_id}/register'),
-            request,
+        def send() -> requests.Response:
+            return self.transport.request(
+                method,
+                api._create_url(path),
+                headers=api._create_default_headers(),
+                data=data,
+                stream=stream,
+                timeout=timeout,
+            )
+
+        token = api.access_token
+        for attempt in range(2):
+            if not token or attempt:
+                self._authenticate(stale_token=token)
+                token = api.access_token
+
+            response = self.scheduler.run(send, idempotent=idempotent, on_retry=on_retry)
+            if response.status_code != 401 or attempt:
+                return response
+            response.close()
+
+    def _encode_body(self, body: Any) -> bytes:
+        # pyrus-api request models keep the request's JSON values in their attributes
+        try:
+            return self.json_codec.dumps(body if isinstance(body, dict) else vars(body))
+        except TypeError:
+            # values the codec can't encode
+            return self.pyrus_api.serialize_request(body)
+
+    def _authenticate(self, stale_token: Optional[str]) -> None:
+        # When requests of several threads get 401 at once, only the first one re-authenticates
+        with self._auth_lock:
+            api = self.pyrus_api
+            if api.access_token and api.access_token != stale_token:
+                return
+            auth_response = api._auth()
+            if not api.access_token:
+                raise PyrusAuthError(auth_response.get('error'), error_code=auth_response.get('error_code'))
+
+    def _request_json(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        *,
+        timeout: Optional[Timeout] = None,
+        idempotent: Optional[bool] = None,
+        form_id: Optional[int] = None,
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        status_code = None
+        size = None
+        data: dict[str, Any] = {}
+        error = None
+        try:
+            with self._request(method, path, body, timeout=timeout, idempotent=idempotent) as response:
+                status_code = response.status_code
+                size = len(response.content)
+                self._raise_for_error(response)
+                data = self.json_codec.loads(response.content)
+
+            if 'error' in data:
+                raise make_api_error(response.status_code, data)
+            return data
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.emit(Event(
+                'request',
+                duration=time.perf_counter() - started,
+                endpoint=_get_endpoint(method, path),
+                status_code=status_code,
+                bytes=size,
+                form_id=form_id,
+                task_count=len(data['tasks']) if 'tasks' in data else int('task' in data),
+                error=error,
+            ))
+
+    @staticmethod
+    def _raise_for_error(response: requests.Response) -> None:
+        if response.status_code < 400:
+            return
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        raise make_api_error(
+            response.status_code,
+            data if isinstance(data, dict) else {},
+            retry_after=parse_retry_after(response.headers.get('Retry-After')),
         )
-        if 'error' in response:
-            raise Exception(response['error'])  # TODO: proper error handling
 
-        return response.get('tasks', [])
+    def close(self) -> None:
+        self.transport.close()
 
     def comment_task(self, task_id: int, comment: str) -> None:
-        self.pyrus_api.comment_task(task_id, TaskCommentRequest(text=comment))
+        self._request_json('POST', f'/tasks/{task_id}/comments', {'text': comment})
+
+
+def _get_endpoint(method: str, path: str) -> str:
+    # ids are replaced, so requests to the same endpoint are counted together
+    return f'{method} {re.sub(r"/[0-9]+", "/{id}", path)}'
 
 
+# Session set by `with set_session()` is local to the thread or asyncio task (and tasks it creates),
+# the global one is used where no session is set.
 _session: Optional[PyrusORMSession] = None
+_context_session: contextvars.ContextVar[Optional[PyrusORMSession]] = contextvars.ContextVar(
+    'pyrus_orm_session',
+    default=None,
+)
 
 
 def get_session() -> PyrusORMSession:
-    global _session
-    assert _session is not None, 'no pyrus-orm session is set. ' \
-                                 'try calling set_session_global or use `with set_session(..):`'
-    return _session
+    session = peek_session()
+    assert session is not None, 'no pyrus-orm session is set. ' \
+                                'try calling set_session_global or use `with set_session(..):`'
+    return session
 
 
 @contextlib.contextmanager
 def set_session(session: PyrusORMSession):
     assert isinstance(session, PyrusORMSession)
-    global _session
-    prev_value = _session
+    token = _context_session.set(session)
+    try:
+        yield
+    finally:
+        _context_session.reset(token)
 
-    _session = session
-    yield
-    _session = prev_value
+
+def peek_session() -> Optional[PyrusORMSession]:
+    # current session or None, for optional uses of the session
+    session = _context_session.get()
+    return session if session is not None else _session
 
 
 def set_session_global(session: PyrusORMSession) -> None:
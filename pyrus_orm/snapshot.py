@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import marshal
+import os
+import tempfile
+import time
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CatalogRows = tuple[list[str], list[tuple[int, list[str]]]]
+
+
+class CatalogSnapshotStore:
+    """
+    Stores fetched catalogs on a local disk, one file per catalog.
+
+    Files are marshal-encoded (headers, [(item_id, values), ...]) and are read in one call.
+    Snapshots older than `max_age` seconds (None - any age) are ignored.
+    """
+
+    _magic = b'PYRUSORM-CATALOG-1\n'
+
+    def __init__(self, path: Union[str, os.PathLike], max_age: Optional[float] = None):
+        self.path = os.fspath(path)
+        self.max_age = max_age
+
+    def load(self, catalog_id: int) -> Optional[CatalogRows]:
+        file_path = self._get_file_path(catalog_id)
+        try:
+            with open(file_path, 'rb') as f:
+                if f.read(len(self._magic)) != self._magic:
+                    logger.warning('unknown catalog snapshot format: %s', file_path)
+                    return None
+                # marshal builds all rows at once anyway, mapping the file would save nothing
+                saved_at, headers, items = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError):
+            logger.warning('failed to read catalog snapshot %s', file_path, exc_info=True)
+            return None
+
+        if self.max_age is not None and time.time() - saved_at > self.max_age:
+            return None
+
+        return headers, items
+
+    def save(self, catalog_id: int, headers: list[str], items: list[tuple[int, list[str]]]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        data = marshal.dumps((time.time(), list(headers), [(item_id, list(values)) for item_id, values in items]))
+
+        # write to a temporary file first, so concurrent readers never see a partial snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=f'.catalog-{catalog_id}-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._magic)
+                f.write(data)
+            os.replace(tmp_path, self._get_file_path(catalog_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, catalog_id: int) -> None:
+        try:
+            os.unlink(self._get_file_path(catalog_id))
+        except FileNotFoundError:
+            pass
+
+    def _get_file_path(self, catalog_id: int) -> str:
+        return os.path.join(self.path, f'catalog-{int(catalog_id)}.bin')
@@ -0,0 +1,113 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional
+
+_WHITESPACE = re.compile(r'\s*')
+_decoder = json.JSONDecoder()
+
+
+class _JSONStreamReader:
+    """
+    Minimal incremental reader over a stream of JSON text chunks.
+
+    Keeps only the unparsed tail of the stream in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+        for chunk in self._chunks:
+            if chunk:
+                self._buf += self._utf8.decode(chunk)
+                return True
+
+        self._buf += self._utf8.decode(b'', final=True)
+        self._eof = True
+        return True
+
+    def peek(self) -> Optional[str]:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read_more():
+                return None
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f'invalid JSON stream: expected {char!r}, got {found!r}')
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+
+            # a value ending exactly at the buffer end may be truncated (e.g. a number)
+            if end == len(self._buf) and not self._eof:
+                self._read_more()
+                continue
+
+            self._pos = end
+            return value
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: str,
+    other_values: Optional[dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yields items of the array stored under `key` of a top-level JSON object one by one,
+    without loading the whole document into memory.
+
+    Other top-level values are decoded into `other_values` if passed.
+    """
+    reader = _JSONStreamReader(chunks)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() != ']':
+                while True:
+                    yield reader.value()
+                    if reader.peek() != ',':
+                        break
+                    reader.expect(',')
+            reader.expect(']')
+        else:
+            value = reader.value()
+            if other_values is not None:
+                other_values[name] = value
+
+        if reader.peek() != ',':
+            break
+        reader.expect(',')
+
+    reader.expect('}')
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+Timeout = Union[float, tuple[float, float]]  # seconds, or (connect, read)
+
+
+class Transport(ABC):
+    """
+    HTTP layer under PyrusORMSession. Subclass it to route requests elsewhere (e.g. a custom client or a test double).
+    """
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str],
+        data: Optional[Union[str, bytes]] = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class HTTPTransport(Transport):
+    """
+    Keep-alive transport: connections are kept in a pool of `pool_size` per host and reused between requests
+    and threads, responses are requested gzip-compressed and decoded transparently.
+    `timeout` is used for requests made without a timeout of their own.
+
+    requests.Session is not guaranteed to be thread-safe, so every thread gets its own one;
+    all of them share the connection pool (the adapter).
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 10,
+        timeout: Optional[Timeout] = (10, 60),
+        proxies: Optional[dict[str, str]] = None,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.proxies = proxies
+
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._local = threading.local()
+
+    def _get_http(self) -> requests.Session:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = requests.Session()
+            http.mount('http://', self._adapter)
+            http.mount('https://', self._adapter)
+            http.headers['Accept-Encoding'] = 'gzip'
+            if self.proxies:
+                http.proxies.update(self.proxies)
+        return http
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str],
+        data: Optional[Union[str, bytes]] = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        return self._get_http().request(
+            method,
+            url,
+            headers=headers,
+            data=data,
+            stream=stream,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+
+    def close(self) -> None:
+        # sessions own nothing but the shared adapter
+        self._adapter.close()
+
+    def __enter__(self) -> HTTPTransport:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Generic, TypeVar, Type
+from typing import Any, Callable, Generic, TypeVar, Type, Iterable
 
 T = TypeVar("T")
 R = TypeVar("R")
@@ -10,3 +10,17 @@ class classproperty(Generic[T, R]):
 
     def __get__(self, obj: Any, cls: Type[T]) -> R:
         return self.func(cls)
+
+
+def flatten_fields(fields: Iterable[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+    # Flatten 'title' fields. Title is a field type which groups another fields inside.
+    flatten = {}
+    for field in fields:
+        if field.get('type') == 'title':  # TODO: check if title fields can be nested
+            flatten.update({
+                f['id']: f
+                for f in field['value']['fields']
+            })
+        else:
+            flatten[field['id']] = field
+    return flatten
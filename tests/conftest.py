@@ -0,0 +1,100 @@
+from typing import Any, Optional
+
+import pytest
+from pyrus import PyrusAPI
+
+from pyrus_orm.session import PyrusORMSession, set_session
+
+
+def make_task(task_id: int, fields: list[dict[str, Any]], **data: Any) -> dict[str, Any]:
+    # task data as pyrus returns it
+    return {
+        'id': task_id,
+        'create_date': '2020-01-01T00:00:00Z',
+        'last_modified_date': '2020-01-01T00:00:00Z',
+        **data,
+        'fields': fields,
+    }
+
+
+def catalog_value(
+    item_id: int,
+    headers: Optional[list[str]] = None,
+    values: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    value: dict[str, Any] = {'item_id': item_id, 'item_ids': [item_id]}
+    if headers is not None:
+        value.update(headers=headers, values=values)
+    return value
+
+
+@pytest.fixture
+def form_data() -> dict[str, Any]:
+    return {
+        "id": 11610,
+        "create_date": "2017-08-20T12:31:14Z",
+        "last_modified_date": "2017-08-23T10:20:11Z",
+        "current_step": 1,
+        "fields": [
+            {
+                "id": 10,
+                "type": "text",
+                "name": "Purpose",
+                "value": "IT conference in Amsterdam"
+            },
+            {
+                "id": 20,
+                "type": "number",
+                "name": "counter",
+                "value": 42,
+            },
+            {
+                "id": 30,
+                "value": {
+                    "item_id": 80797460,
+                    "item_ids": [
+                        80797460
+                    ],
+                    "headers": [
+                        "Vendor Name",
+                        "Vendor Code"
+                    ],
+                    "values": [
+                        "GE",
+                        "123"
+                    ],
+                    "rows": [
+                        [
+                            "GE",
+                            "123"
+                        ]
+                    ]
+                }
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def session():
+    session = PyrusORMSession(PyrusAPI())
+    with set_session(session):
+        yield session
+
+
+@pytest.fixture
+def pyrus_server():
+    from tests.fake_server import FakePyrusServer
+
+    server = FakePyrusServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def server_session(pyrus_server):
+    # session talking to the fake server
+    session = PyrusORMSession(pyrus_server.make_pyrus_api())
+    with set_session(session):
+        yield session
@@ -0,0 +1,202 @@
+import collections
+import copy
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from pyrus import PyrusAPI
+
+from pyrus_orm.utils import flatten_fields
+
+
+class FakePyrusServer:
+    """
+    Local HTTP server imitating a small subset of Pyrus API: tasks, comments, form registers and catalogs
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.tasks: dict[int, dict[str, Any]] = {}
+        self.catalogs: dict[int, dict[str, Any]] = {}
+        self.requests: list[tuple[str, str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections: set[tuple[str, int]] = set()  # client addresses, one per opened connection
+        self.gzip = False
+        self.failures: collections.deque[tuple[int, dict[str, str]]] = collections.deque()
+        self._lock = threading.Lock()
+        self._next_id = 1000
+
+        handler = type('Handler', (_Handler,), {'fake': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+
+    @property
+    def address(self) -> str:
+        return f'127.0.0.1:{self._server.server_port}'
+
+    def make_pyrus_api(self) -> PyrusAPI:
+        api = PyrusAPI(access_token='token')
+        api._protocol = 'http'
+        api._host = self.address
+        return api
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_task(self, task: dict[str, Any]) -> None:
+        self.tasks[task['id']] = copy.deepcopy(task)
+
+    def fail_next(self, status: int, times: int = 1, retry_after: Optional[str] = None) -> None:
+        headers = {'Retry-After': retry_after} if retry_after is not None else {}
+        self.failures.extend([(status, headers)] * times)
+
+    def handle(self, method: str, path: str, body: Any) -> tuple[int, Any, dict[str, str]]:
+        with self._lock:
+            self.requests.append((method, path, body))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failure = self.failures.popleft() if self.failures else None
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if failure is not None:
+                status, headers = failure
+                return status, {'error': 'failure', 'error_code': f'http_{status}'}, headers
+            return (*self._route(method, path, body), {})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _route(self, method: str, path: str, body: Any) -> tuple[int, Any]:
+        if m := re.fullmatch(r'/tasks/(\d+)', path):
+            task = self.tasks.get(int(m[1]))
+            if task is None:
+                return 404, {'error': 'task not found', 'error_code': 'not_found'}
+            return 200, {'task': task}
+
+        if m := re.fullmatch(r'/tasks/(\d+)/comments', path):
+            task = self.tasks.get(int(m[1]))
+            if task is None:
+                return 404, {'error': 'task not found', 'error_code': 'not_found'}
+            self._apply_field_updates(task, (body or {}).get('field_updates') or [])
+            return 200, {'task': task}
+
+        if path == '/tasks' and method == 'POST':
+            with self._lock:
+                self._next_id += 1
+                task_id = self._next_id
+            task = {
+                'id': task_id,
+                'create_date': '2020-01-01T00:00:00Z',
+                'last_modified_date': '2020-01-01T00:00:00Z',
+                'fields': [{'id': f['id'], 'value': f['value']} for f in body.get('fields', [])],
+            }
+            self.tasks[task_id] = task
+            return 200, {'task': task}
+
+        if m := re.fullmatch(r'/forms/(\d+)/register', path):
+            body = body or {}
+            tasks = [x for x in self.tasks.values() if _match_register_filters(x, body)]
+            if body.get('field_ids'):
+                tasks = [
+                    {**x, 'fields': [f for f in flatten_fields(x['fields']).values() if f['id'] in body['field_ids']]}
+                    for x in tasks
+                ]
+            return 200, {'tasks': tasks}
+
+        if m := re.fullmatch(r'/catalogs/(\d+)', path):
+            catalog = self.catalogs.get(int(m[1]))
+            if catalog is None:
+                return 404, {'error': 'catalog not found', 'error_code': 'not_found'}
+            return 200, catalog
+
+        return 404, {'error': 'not found'}
+
+    def _apply_field_updates(self, task: dict[str, Any], field_updates: list[dict[str, Any]]) -> None:
+        if not field_updates:
+            return
+        fields = {f['id']: f for f in task['fields']}
+        for update in field_updates:
+            if update['id'] in fields:
+                fields[update['id']]['value'] = update['value']
+            else:
+                task['fields'].append(dict(update))
+        task['last_modified_date'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def _match_register_filters(task: dict[str, Any], request: dict[str, Any]) -> bool:
+    # strict gt/lt, 'empty', '*' and comma-separated lists of catalog items / choices
+    values = {f['id']: f.get('value') for f in task['fields']}
+
+    for key, condition in request.items():
+        if not key.startswith('fld'):
+            continue
+        value = values.get(int(key[3:]))
+        if isinstance(value, dict):
+            value = value.get('item_id', value.get('choice_ids'))
+
+        if condition == 'empty':
+            ok = value in (None, '', [])
+        elif condition == '*':
+            ok = value not in (None, '', [])
+        elif isinstance(condition, str) and condition.startswith(('gt', 'lt')):
+            ok = value is not None
+            for part in condition.split(','):
+                bound = type(value)(part[2:]) if isinstance(value, (int, float)) else part[2:]
+                ok = ok and (value > bound if part.startswith('gt') else value < bound)
+        elif isinstance(value, (int, list)) and isinstance(condition, str):
+            expected = {int(x) for x in condition.split(',')}
+            ok = bool(expected & set(value if isinstance(value, list) else [value]))
+        else:
+            ok = value == condition
+
+        if not ok:
+            return False
+
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakePyrusServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle('GET')
+
+    def do_POST(self) -> None:
+        self._handle('POST')
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        body: Optional[Any] = json.loads(raw_body) if raw_body else None
+
+        # only the api path matters
+        path = self.path.split('?')[0].rsplit('/v4', 1)[-1]
+        with self.fake._lock:
+            self.fake.connections.add(self.client_address)
+        status, response, headers = self.fake.handle(method, path, body)
+
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if self.fake.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            data = gzip.compress(data)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from pyrus_orm.async_session import AsyncPyrusORMSession
+from pyrus_orm.fields import TextField, NumericField
+from pyrus_orm.model import PyrusModel
+from pyrus_orm.session import set_session
+
+
+class AsyncModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+
+    class Meta:
+        form_id = 123
+
+
+@pytest.fixture
+def async_session(pyrus_server):
+    session = AsyncPyrusORMSession(pyrus_server.make_pyrus_api(), max_concurrency=4)
+    with set_session(session):
+        yield session
+    session.close()
+
+
+def test_aget_and_asave(pyrus_server, async_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+
+    async def main():
+        model = await AsyncModel.objects.aget(form_data['id'])
+        assert model.purpose == 'IT conference in Amsterdam'
+
+        model.counter = 43
+        await model.asave('counter changed')
+        await model.acomment('just a comment')
+
+        return await AsyncModel.objects.afilter()
+
+    models = asyncio.run(main())
+
+    assert [m.counter for m in models] == [43]
+    assert pyrus_server.requests[1] == (
+        'POST', f'/tasks/{form_data["id"]}/comments',
+        {'text': 'counter changed', 'field_updates': [{'id': 20, 'value': 43}]},
+    )
+
+
+def test_acreate(pyrus_server, async_session) -> None:
+    model = AsyncModel(purpose='new one', counter=1)
+    asyncio.run(model.asave())
+
+    assert model.id in pyrus_server.tasks
+    assert model.purpose == 'new one'
+
+
+def test_concurrency_is_bounded(pyrus_server, async_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.delay = 0.05
+    for i in range(12):
+        pyrus_server.add_task({**form_data, 'id': i + 1})
+
+    async def main():
+        return await asyncio.gather(*(AsyncModel.objects.aget(i + 1) for i in range(12)))
+
+    models = asyncio.run(main())
+
+    assert [m.id for m in models] == list(range(1, 13))
+    assert 1 < pyrus_server.max_in_flight <= 4
+
+
+def test_async_hooks(pyrus_server, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    events = []
+    session = AsyncPyrusORMSession(pyrus_server.make_pyrus_api(), hooks=[events.append])
+
+    with set_session(session):
+        model = asyncio.run(AsyncModel.objects.aget(form_data['id']))
+    session.close()
+
+    assert model.id == form_data['id']
+    assert [x.name for x in events] == ['request', 'decode']
+
+
+def test_asave_skips_unchanged(pyrus_server, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    events = []
+    session = AsyncPyrusORMSession(pyrus_server.make_pyrus_api(), hooks=[events.append])
+
+    async def main():
+        model = await AsyncModel.objects.aget(form_data['id'])
+        model.counter = 42
+        await model.asave()
+
+    with set_session(session):
+        asyncio.run(main())
+    session.close()
+
+    assert len(pyrus_server.requests) == 1
+    assert events[-1].name == 'save_skipped'
@@ -0,0 +1,83 @@
+from typing import Any
+
+from pyrus_orm.fields import TextField, NumericField
+from pyrus_orm.model import PyrusModel
+
+
+class BulkModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+
+    class Meta:
+        form_id = 123
+
+
+def test_get_many(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.delay = 0.02
+    for i in range(1, 21):
+        pyrus_server.add_task({**form_data, 'id': i})
+
+    task_ids = [5, 3, 404, *range(6, 21)]
+    results = list(BulkModel.objects.get_many(task_ids, concurrency=4))
+
+    assert [r.key for r in results] == task_ids
+    assert [r.result.id for r in results if r.ok] == [x for x in task_ids if x != 404]
+    assert [r.key for r in results if not r.ok] == [404]
+    assert 1 < pyrus_server.max_in_flight <= 4
+
+
+def test_get_many_as_completed(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    for i in range(1, 6):
+        pyrus_server.add_task({**form_data, 'id': i})
+
+    results = list(BulkModel.objects.get_many(range(1, 6), concurrency=2, ordered=False))
+
+    assert sorted(r.result.id for r in results) == [1, 2, 3, 4, 5]
+
+
+def test_save_many(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    for i in range(1, 6):
+        pyrus_server.add_task({**form_data, 'id': i})
+
+    models = [r.result for r in BulkModel.objects.get_many(range(1, 6))]
+    for model in models[:3]:
+        model.counter = model.id * 10
+    models.append(BulkModel(purpose='new one'))
+    pyrus_server.requests.clear()
+
+    results = PyrusModel.save_many(models, 'bulk update', concurrency=3)
+
+    assert [r.key for r in results] == models
+    assert [r.skipped for r in results] == [False, False, False, True, True, False]
+    assert all(r.ok for r in results)
+    assert len(pyrus_server.requests) == 4
+
+    assert [m.counter for m in models[:3]] == [10, 20, 30]
+    assert all(not m._changed_fields for m in models)
+    assert models[-1].id in pyrus_server.tasks
+
+
+def test_save_many_reports_errors(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    existing = BulkModel.objects.get(form_data['id'])
+    existing.counter = 1
+    missing = BulkModel.from_pyrus_data({**form_data, 'id': 404})
+    missing.counter = 1
+
+    results = PyrusModel.save_many([missing, existing], rate_limit=100)
+
+    assert not results[0].ok
+    assert results[1].ok
+    assert existing.counter == 1
+
+
+def test_save_many_saves_model_once(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    model = BulkModel.objects.get(form_data['id'])
+    model.counter = 1
+    pyrus_server.requests.clear()
+
+    results = PyrusModel.save_many([model, model], 'once', concurrency=2)
+
+    assert [(r.key, r.ok, r.skipped) for r in results] == [(model, True, False), (model, True, False)]
+    assert len(pyrus_server.requests) == 1
@@ -0,0 +1,89 @@
+import threading
+
+from pyrus_orm.cache import CatalogCache
+from pyrus_orm.catalog import _CatalogListWrapper
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLoader:
+    def __init__(self):
+        self.calls: list[int] = []
+
+    def __call__(self, catalog_id: int) -> _CatalogListWrapper:
+        self.calls.append(catalog_id)
+        return _CatalogListWrapper()
+
+
+def test_cache_hit_and_invalidate() -> None:
+    cache = CatalogCache()
+    loader = FakeLoader()
+
+    catalog = cache.get(1, loader)
+    assert cache.get(1, loader) is catalog
+    assert loader.calls == [1]
+
+    cache.invalidate(1)
+    assert cache.get(1, loader) is not catalog
+    assert loader.calls == [1, 1]
+
+
+def test_cache_lru_eviction() -> None:
+    cache = CatalogCache(maxsize=2)
+    loader = FakeLoader()
+
+    cache.get(1, loader)
+    cache.get(2, loader)
+    cache.get(1, loader)
+    cache.get(3, loader)
+
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache
+
+
+def test_cache_ttl() -> None:
+    clock = FakeClock()
+    cache = CatalogCache(ttl=10, ttls={2: None}, clock=clock)
+    loader = FakeLoader()
+
+    first = cache.get(1, loader)
+    cache.get(2, loader)
+    clock.now = 9
+    assert cache.get(1, loader) is first
+
+    clock.now = 10
+    assert cache.get(1, loader) is not first
+    cache.get(2, loader)
+    assert loader.calls == [1, 2, 1]
+
+
+def test_cache_revalidate_in_background() -> None:
+    clock = FakeClock()
+    cache = CatalogCache(ttl=10, revalidate=True, clock=clock)
+    loader = FakeLoader()
+    stale = cache.get(1, loader)
+
+    refreshed = threading.Event()
+
+    def slow_loader(catalog_id: int) -> _CatalogListWrapper:
+        refreshed.wait(5)
+        return loader(catalog_id)
+
+    clock.now = 20
+    assert cache.get(1, slow_loader) is stale
+    assert cache.get(1, slow_loader) is stale
+
+    refreshed.set()
+    for thread in threading.enumerate():
+        if thread.name == 'pyrus-orm-catalog-1':
+            thread.join(5)
+
+    assert cache.get(1, slow_loader) is not stale
+    assert loader.calls == [1, 1]
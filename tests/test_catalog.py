@@ -0,0 +1,90 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.catalog import CatalogItem, _CatalogListWrapper
+from pyrus_orm.fields import CatalogField
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+@pytest.fixture
+def catalog() -> _CatalogListWrapper:
+    headers = ['Name', 'Country']
+    rows = [
+        (1, ['Cervantes', 'Spain']),
+        (2, ['Avellaneda', 'Spain']),
+        (3, ['Shakespeare', 'England']),
+    ]
+    return _CatalogListWrapper(
+        CatalogItem(
+            item_id=item_id,
+            catalog_id=1,
+            headers=headers,
+            values_row=values,
+            values=dict(zip(headers, values)),
+        )
+        for item_id, values in rows
+    )
+
+
+def test_find(catalog: _CatalogListWrapper) -> None:
+    assert catalog.find({'Name': 'Shakespeare'}).item_id == 3
+    assert catalog.find({'Country': 'Spain'}).item_id == 1
+    assert catalog.find({'Country': 'Spain', 'Name': 'Avellaneda'}).item_id == 2
+    assert catalog.find({'Name': 'Avellaneda', 'Country': 'England'}) is None
+    assert catalog.find({'Name': 'Tolstoy'}) is None
+
+
+def test_find_all(catalog: _CatalogListWrapper) -> None:
+    assert [x.item_id for x in catalog.find_all({'Country': 'Spain'})] == [1, 2]
+    assert catalog.find_all({'Country': 'Russia'}) == []
+
+
+def test_find_unknown_header(catalog: _CatalogListWrapper) -> None:
+    with pytest.raises(KeyError):
+        catalog.find({'Year': '1605'})
+
+
+def test_get_by_id(catalog: _CatalogListWrapper) -> None:
+    assert catalog.get_by_id(2).values['Name'] == 'Avellaneda'
+    assert catalog.get_by_id(4) is None
+
+
+class Book(PyrusModel):
+    author = CatalogField(30, catalog_id=1)
+
+    class Meta:
+        form_id = 1
+
+
+def _book_data() -> dict[str, Any]:
+    return make_task(1, [
+        {'id': 30, 'type': 'catalog', 'value': catalog_value(3, ['Name', 'Country'], ['Shakespeare', 'England'])},
+    ])
+
+
+def test_catalog_value_is_cached_per_instance() -> None:
+    book = Book.from_pyrus_data(_book_data())
+
+    author = book.author
+    assert book.author is author
+    assert author.values == {'Name': 'Shakespeare', 'Country': 'England'}
+
+    book.author = 1
+    assert book.author is not author
+    assert book.author.item_id == 1
+    assert Book.from_pyrus_data(_book_data()).author is not author
+
+
+def test_catalog_value_shares_cached_catalog(catalog: _CatalogListWrapper, session) -> None:
+    session.catalog_cache.set(1, catalog)
+    book = Book.from_pyrus_data(_book_data())
+
+    assert book.author.values is catalog.get_by_id(3).values
+    assert book.as_dict()['author'] == {'Name': 'Shakespeare', 'Country': 'England'}
+    assert book.as_dict()['author'] is not catalog.get_by_id(3).values
+
+    book.author.find_and_set({'Name': 'Cervantes'})
+    assert book.author.item_id == 1
+    assert book.get_pyrus_fields_data(changed_only=True) == [{'id': 30, 'value': {'item_id': 1}}]
@@ -0,0 +1,86 @@
+from enum import Enum
+from typing import Any
+
+import pytest
+
+from pyrus_orm.catalog import CatalogItem, _CatalogListWrapper
+from pyrus_orm.fields import CatalogEnumField
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+class Genre(Enum):
+    novel = 'N'
+    drama = 'D'
+
+
+class GenreId(Enum):
+    novel = 1
+    drama = 2
+
+
+class Book(PyrusModel):
+    genre = CatalogEnumField(30, catalog_id=7, enum=Genre, id_field='Code')
+    genre_id = CatalogEnumField(31, catalog_id=7, enum=GenreId, id_field='item_id')
+
+    class Meta:
+        form_id = 1
+
+
+def _make_catalog(*rows: tuple[int, str, str]) -> _CatalogListWrapper:
+    headers = ['Name', 'Code']
+    return _CatalogListWrapper(
+        CatalogItem(item_id=item_id, catalog_id=7, headers=headers, values_row=[name, code],
+                    values={'Name': name, 'Code': code})
+        for item_id, name, code in rows
+    )
+
+
+def _book_data(item_id: int, code: str) -> dict[str, Any]:
+    return make_task(1, [
+        {'id': 30, 'type': 'catalog', 'value': catalog_value(item_id, ['Name', 'Code'], ['x', code])},
+        {'id': 31, 'type': 'catalog', 'value': catalog_value(item_id)},
+    ])
+
+
+def test_get(session) -> None:
+    book = Book.from_pyrus_data(_book_data(2, 'D'))
+    assert book.genre is Genre.drama  # from the task data, catalog is not loaded
+    assert book.genre_id is GenreId.drama
+
+    session.catalog_cache.set(7, _make_catalog((1, 'Novel', 'N'), (2, 'Drama', 'D')))
+    assert book.genre is Genre.drama
+
+    with pytest.raises(ValueError):
+        _ = Book.from_pyrus_data(_book_data(3, 'P')).genre
+
+
+def test_set(session) -> None:
+    catalog = _make_catalog((1, 'Novel', 'N'), (2, 'Drama', 'D'), (3, 'Drama, again', 'D'))
+    session.catalog_cache.set(7, catalog)
+
+    book = Book()
+    book.genre = Genre.drama
+    book.genre_id = GenreId.novel
+    assert book.get_pyrus_fields_data() == [{'id': 30, 'value': {'item_id': 2}}, {'id': 31, 'value': {'item_id': 1}}]
+    assert list(catalog._derived) == [(Genre, 'Code')]
+
+    # a new catalog version gets its own mapping
+    session.catalog_cache.set(7, _make_catalog((5, 'Drama', 'D')))
+    book.genre = Genre.drama
+    assert book.get_pyrus_fields_data()[0] == {'id': 30, 'value': {'item_id': 5}}
+
+    with pytest.raises(ValueError):
+        book.genre = Genre.novel
+
+
+def test_warmup(session) -> None:
+    session.catalog_cache.set(7, _make_catalog((1, 'Novel', 'N'), (2, 'Drama', 'D')))
+    Book.Meta.fields['genre'].warmup()
+    Book.Meta.fields['genre_id'].warmup()
+
+    session.catalog_cache.set(7, _make_catalog((2, 'Drama', 'D')))
+    with pytest.raises(ValueError, match='Genre members: novel'):
+        Book.Meta.fields['genre'].warmup()
+    with pytest.raises(ValueError, match='GenreId members: novel'):
+        Book.Meta.fields['genre_id'].warmup()
@@ -0,0 +1,63 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.fields import CatalogField, TextField
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+class Book(PyrusModel):
+    title = TextField(1)
+    author = CatalogField(2, catalog_id=10)
+    publisher = CatalogField(3, catalog_id=11)
+
+    class Meta:
+        form_id = 1
+
+
+def _book(task_id: int, title: str, author_id: int) -> dict[str, Any]:
+    return make_task(task_id, [
+        {'id': 1, 'type': 'text', 'value': title},
+        {'id': 2, 'type': 'catalog', 'value': catalog_value(author_id)},
+        {'id': 3, 'type': 'catalog', 'value': catalog_value(500)},
+    ])
+
+
+@pytest.fixture
+def server_books(pyrus_server) -> None:
+    pyrus_server.catalogs[10] = {
+        'catalog_headers': [{'name': 'Name'}, {'name': 'Country'}],
+        'items': [
+            {'item_id': 100, 'values': ['Cervantes', 'Spain']},
+            {'item_id': 200, 'values': ['Shakespeare', 'England']},
+        ],
+    }
+    pyrus_server.add_task(_book(1, 'Don Quixote', 100))
+    pyrus_server.add_task(_book(2, 'Hamlet', 200))
+    pyrus_server.add_task(_book(3, 'Unknown', 300))
+
+
+def test_join_catalogs(pyrus_server, server_session, server_books) -> None:
+    books = Book.objects.get_filtered(only=['title', 'author'], join_catalogs=True)
+    # the catalog of `publisher` is not requested, it's not in the projection
+    assert [x[1] for x in pyrus_server.requests].count('/catalogs/10') == 1
+    assert '/catalogs/11' not in [x[1] for x in pyrus_server.requests]
+
+    server_session.catalog_cache.clear()
+    assert books[0].author.values == {'Name': 'Cervantes', 'Country': 'Spain'}
+    assert books[1].as_dict()['author'] == {'Name': 'Shakespeare', 'Country': 'England'}
+    # items missing from the catalog are kept as received
+    assert books[2].author.item_id == 300
+    assert books[2].author.values == {}
+
+    books[0].title = 'Don Quixote de la Mancha'
+    assert books[0].get_pyrus_fields_data(changed_only=True) == [
+        {'id': 1, 'value': 'Don Quixote de la Mancha'},
+    ]
+
+
+def test_join_catalogs_streamed(server_session, server_books) -> None:
+    books = list(Book.objects.iter_filtered(only=['author'], join_catalogs=True, lazy=True))
+
+    assert [x.author.values.get('Name') for x in books] == ['Cervantes', 'Shakespeare', None]
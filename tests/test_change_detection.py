@@ -0,0 +1,72 @@
+from enum import Enum
+from typing import Any
+
+from pyrus_orm.catalog import CatalogItem
+from pyrus_orm.fields import TextField, NumericField, CatalogField, MultipleChoiceField
+from pyrus_orm.model import PyrusModel
+
+
+class Color(Enum):
+    red = 1
+    green = 2
+
+
+class TrackedModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+    vendor = CatalogField(30, catalog_id=12345)
+    colors = MultipleChoiceField(50, enum=Color)
+
+    class Meta:
+        form_id = 123
+
+
+def _with_colors(form_data: dict[str, Any]) -> dict[str, Any]:
+    form_data['fields'].append({'id': 50, 'type': 'multiple_choice', 'value': {'choice_ids': [2, 1]}})
+    return form_data
+
+
+def test_same_values_are_not_changes(form_data: dict[str, Any], session) -> None:
+    model = TrackedModel.from_pyrus_data(_with_colors(form_data))
+
+    model.purpose = 'IT conference in Amsterdam'
+    model.counter = 42
+    model.vendor = CatalogItem(item_id=80797460)
+    model.colors = {Color.red, Color.green}
+
+    assert not model.has_changes()
+    assert model.get_pyrus_fields_data(changed_only=True) == []
+
+
+def test_changes_are_detected(form_data: dict[str, Any], session) -> None:
+    model = TrackedModel.from_pyrus_data(_with_colors(form_data), lazy=True)
+
+    model.purpose = 'other'
+    model.vendor = 1
+    model.colors = {Color.red}
+    model.counter = 42
+
+    assert model.get_pyrus_fields_data(changed_only=True) == [
+        {'id': 10, 'value': 'other'},
+        {'id': 30, 'value': {'item_id': 1}},
+        {'id': 50, 'value': {'choice_ids': [1]}},
+    ]
+
+    model.purpose = 'IT conference in Amsterdam'
+    model.vendor = 80797460
+    model.colors = {Color.red, Color.green}
+    assert not model.has_changes()
+
+
+def test_save_skips_request_without_changes(pyrus_server, server_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+
+    model = TrackedModel.objects.get(form_data['id'])
+    model.counter = 42
+    model.save('nothing changed')
+    assert len(pyrus_server.requests) == 1
+
+    model.counter = 43
+    model.save('counter changed')
+    assert len(pyrus_server.requests) == 2
+    assert pyrus_server.requests[-1][2]['field_updates'] == [{'id': 20, 'value': 43}]
@@ -0,0 +1,79 @@
+import sys
+from typing import Any
+
+import pytest
+
+from pyrus_orm.codec import copy_json
+from pyrus_orm.fields import TextField, NumericField, DateField, CatalogField
+from pyrus_orm.model import PyrusModel
+
+
+class Unordered(PyrusModel):
+    vendor = CatalogField(30, catalog_id=12345)
+    purpose = TextField(10)
+    day = DateField(40)
+    counter = NumericField(20)
+
+    class Meta:
+        form_id = 123
+
+
+def test_codec_tables() -> None:
+    codec = Unordered._codec
+    assert [x.id for x in codec.sorted_fields] == [10, 20, 30, 40]
+    assert codec.fields_by_id[30] is Unordered.Meta.fields['vendor']
+    # only dates need serialization here
+    assert [serialize is None for _, serialize in codec.encoders] == [True, True, True, False]
+
+
+def test_decoded_same_as_lazy(form_data: dict[str, Any]) -> None:
+    form_data['fields'].append({'id': 1, 'type': 'title', 'value': {'fields': [
+        {'id': 40, 'type': 'date', 'value': '2020-02-03'},
+    ]}})
+
+    eager = Unordered.from_pyrus_data(form_data)
+    lazy = Unordered.from_pyrus_data(form_data, lazy=True)
+
+    assert eager._raw_field_values == {}
+    assert eager.as_dict() == lazy.as_dict()
+    assert eager._field_values == lazy._field_values
+    assert eager.get_pyrus_fields_data() == lazy.get_pyrus_fields_data()
+    assert [x['id'] for x in eager.get_pyrus_fields_data()] == [10, 20, 30, 40]
+
+
+def test_payload_is_copied(form_data: dict[str, Any]) -> None:
+    model = Unordered.from_pyrus_data(form_data)
+    form_data['fields'][2]['value']['values'][0] = 'changed'
+    form_data['fields'][0]['value'] = 'changed'
+
+    assert model.vendor.values['Vendor Name'] == 'GE'
+    assert model.purpose == 'IT conference in Amsterdam'
+    assert not model.has_changes()
+
+
+def test_payload_is_not_copied(form_data: dict[str, Any]) -> None:
+    model = Unordered.from_pyrus_data(form_data, copy=False)
+
+    assert model._field_values[30]['value'] is form_data['fields'][2]['value']
+    assert model.purpose == 'IT conference in Amsterdam'
+    model.purpose = 'changed'
+    assert form_data['fields'][0]['value'] == 'IT conference in Amsterdam'
+
+
+def test_decode_error_note(form_data: dict[str, Any]) -> None:
+    form_data['fields'].append({'id': 40, 'type': 'date', 'value': 'not a date'})
+
+    with pytest.raises(ValueError) as e:
+        Unordered.from_pyrus_data(form_data)
+
+    if sys.version_info >= (3, 11):
+        assert e.value.__notes__ == [f"Task id: 11610, field struct: {form_data['fields'][-1]}"]
+
+
+def test_copy_json() -> None:
+    data = {'a': [1, {'b': [2, 3]}], 'c': 'd', 'e': None}
+    copied = copy_json(data)
+
+    assert copied == data
+    assert copied['a'] is not data['a']
+    assert copied['a'][1]['b'] is not data['a'][1]['b']
@@ -0,0 +1,92 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from pyrus_orm.fields import (
+    TextField, NumericField, IntegerField, CatalogField, DateField, DueDateTimeField, CheckmarkField,
+)
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+class Report(PyrusModel):
+    title = TextField(10)
+    amount = NumericField(20)
+    count = IntegerField(21)
+    vendor = CatalogField(30, catalog_id=12345)
+    day = DateField(40)
+    due = DueDateTimeField(41)
+    done = CheckmarkField(50)
+
+    class Meta:
+        form_id = 555
+
+
+@pytest.fixture
+def report_session(pyrus_server, server_session):
+    pyrus_server.add_task(make_task(1, [
+        {'id': 10, 'type': 'text', 'value': 'first'},
+        {'id': 20, 'type': 'number', 'value': 1.5},
+        {'id': 21, 'type': 'number', 'value': 7},
+        {'id': 30, 'type': 'catalog', 'value': catalog_value(100, ['Name'], ['GE'])},
+        {'id': 1, 'type': 'title', 'value': {'fields': [
+            {'id': 40, 'type': 'date', 'value': '2020-02-03'},
+            {'id': 41, 'type': 'due_date_time', 'value': '2020-02-03T10:00:00Z'},
+        ]}},
+        {'id': 50, 'type': 'checkmark', 'value': 'checked'},
+    ]))
+    pyrus_server.add_task(make_task(2, [{'id': 10, 'type': 'text', 'value': 'second'}]))
+
+
+def test_python_columns(pyrus_server, report_session) -> None:
+    columns = Report.objects.to_columns()
+
+    assert columns == {
+        'id': [1, 2],
+        'title': ['first', 'second'],
+        'amount': [1.5, None],
+        'count': [7, None],
+        'vendor': [100, None],
+        'day': [date(2020, 2, 3), None],
+        'due': [datetime(2020, 2, 3, 10, tzinfo=timezone.utc), None],
+        'done': [True, False],
+    }
+
+
+def test_projection_is_requested(pyrus_server, report_session) -> None:
+    assert Report.objects.to_columns('title', 'vendor') == {
+        'id': [1, 2],
+        'title': ['first', 'second'],
+        'vendor': [100, None],
+    }
+    assert pyrus_server.requests[-1][2]['field_ids'] == [10, 30]
+
+
+def test_id_column_can_be_requested(pyrus_server, report_session) -> None:
+    assert Report.objects.to_columns('id', 'title') == {'id': [1, 2], 'title': ['first', 'second']}
+    assert Report.objects.to_columns('id') == {'id': [1, 2]}
+    assert pyrus_server.requests[-1][2]['field_ids'] == [10]
+
+
+def test_numpy_columns(pyrus_server, report_session) -> None:
+    np = pytest.importorskip('numpy')
+
+    columns = Report.objects.to_columns(format='numpy')
+
+    assert columns['amount'].dtype == np.float64
+    assert np.isnan(columns['amount'][1])
+    assert columns['vendor'].dtype == np.int64
+    assert columns['vendor'].mask.tolist() == [False, True]
+    assert columns['day'].tolist()[0] == date(2020, 2, 3)
+    assert np.isnat(columns['due'][1])
+    assert columns['done'].tolist() == [True, False]
+    assert columns['title'].tolist() == ['first', 'second']
+
+
+def test_arrow_columns(pyrus_server, report_session) -> None:
+    pytest.importorskip('pyarrow')
+
+    table = Report.objects.to_columns('count', 'day', format='arrow')
+
+    assert table.column_names == ['id', 'count', 'day']
+    assert table.to_pydict() == {'id': [1, 2], 'count': [7, None], 'day': [date(2020, 2, 3), None]}
@@ -0,0 +1,121 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.events import Event, Histogram
+from pyrus_orm.fields import TextField
+from pyrus_orm.model import PyrusModel
+from pyrus_orm.scheduler import RequestScheduler
+from pyrus_orm.session import PyrusORMSession, set_session
+
+
+class Trip(PyrusModel):
+    purpose = TextField(10)
+
+    class Meta:
+        form_id = 123
+
+
+@pytest.fixture
+def events() -> list[Event]:
+    return []
+
+
+@pytest.fixture
+def session(pyrus_server, form_data: dict[str, Any], events: list[Event]):
+    pyrus_server.add_task({**form_data, 'id': 1})
+    pyrus_server.add_task({**form_data, 'id': 2})
+    pyrus_server.catalogs[5] = {'catalog_headers': [{'name': 'Name'}], 'items': [{'item_id': 1, 'values': ['a']}]}
+
+    session = PyrusORMSession(
+        pyrus_server.make_pyrus_api(),
+        scheduler=RequestScheduler(backoff=0),
+        hooks=[events.append],
+    )
+    with set_session(session):
+        yield session
+
+
+def test_request_events(session, events: list[Event]) -> None:
+    session.get_task_raw(1)
+    session.get_filtered_tasks(123)
+    list(session.iter_filtered_tasks(123))
+
+    assert [(x.name, x.endpoint, x.status_code, x.form_id, x.task_count) for x in events] == [
+        ('request', 'GET /tasks/{id}', 200, None, 1),
+        ('request', 'POST /forms/{id}/register', 200, 123, 2),
+        ('request', 'POST /forms/{id}/register', 200, 123, 2),
+    ]
+    assert all(x.bytes > 0 and x.duration > 0 for x in events)
+    assert events[1].bytes == events[2].bytes
+
+
+def test_stats(pyrus_server, session) -> None:
+    Trip.objects.get(1)
+    list(Trip.objects.iter_filtered())
+    with pytest.raises(Exception):
+        Trip.objects.get(404)
+
+    session.get_catalog(5)
+    session.get_catalog(5)
+
+    pyrus_server.fail_next(503)
+    trip = Trip.objects.get(2)
+    trip.save()
+    trip.purpose = 'changed'
+    trip.save()
+
+    stats = session.stats()
+    assert stats['requests']['GET /tasks/{id}']['count'] == 3
+    assert stats['requests']['GET /tasks/{id}']['errors'] == 1
+    assert stats['requests']['GET /tasks/{id}']['duration']['count'] == 3
+    assert stats['requests']['POST /forms/{id}/register']['count'] == 1
+    assert stats['requests']['POST /tasks/{id}/comments']['count'] == 1
+    assert stats['retries'] == 1
+    assert stats['decode']['tasks'] == 4
+    assert stats['catalog_cache'] == {'hits': 1, 'misses': 1}
+    assert stats['saves']['count'] == 1
+    assert stats['saves']['skipped'] == 1
+
+    session.stats(reset=True)
+    assert session.stats()['requests'] == {}
+
+
+def test_save_many_events(session, events: list[Event]) -> None:
+    unchanged = Trip.objects.get(1)
+    changed = Trip.objects.get(2)
+    changed.purpose = 'changed'
+    unchanged.purpose = unchanged.purpose
+
+    PyrusModel.save_many([unchanged, changed])
+
+    assert sorted(x.task_id for x in events if x.name == 'save_skipped') == [1]
+    assert [x.task_id for x in events if x.name == 'save'] == [2]
+    assert session.stats()['saves']['skipped'] == 1
+    assert not unchanged._changed_fields
+
+
+def test_failing_hook(session, events: list[Event]) -> None:
+    def hook(event: Event) -> None:
+        raise RuntimeError('broken hook')
+
+    session.add_hook(hook)
+    assert session.get_task_raw(1)['id'] == 1
+    session.remove_hook(hook)
+
+    assert len(events) == 1
+    assert session.stats()['requests']['GET /tasks/{id}']['count'] == 1
+
+
+def test_histogram() -> None:
+    histogram = Histogram()
+    for value in (0.0005, 0.003, 0.003, 20):
+        histogram.observe(value)
+
+    result = histogram.as_dict()
+    assert result['count'] == 4
+    assert result['sum'] == pytest.approx(20.0065)
+    assert result['buckets'][0.001] == 1
+    assert result['buckets'][0.005] == 3
+    assert result['buckets'][10.0] == 3
+    assert result['buckets'][float('inf')] == 4
@@ -0,0 +1,87 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.fields import TextField, NumericField
+from pyrus_orm.identity_map import IdentityMap
+from pyrus_orm.model import PyrusModel
+from pyrus_orm.session import PyrusORMSession, set_session
+
+
+class MappedModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+
+    class Meta:
+        form_id = 123
+
+
+@pytest.fixture
+def mapped_session(pyrus_server):
+    session = PyrusORMSession(pyrus_server.make_pyrus_api(), identity_map=IdentityMap(maxsize=2))
+    with set_session(session):
+        yield session
+
+
+def test_get_returns_loaded_model(pyrus_server, mapped_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+
+    model = MappedModel.objects.get(form_data['id'])
+    assert MappedModel.objects.get(form_data['id']) is model
+    assert MappedModel.objects.get_filtered()[0] is model
+    assert len(pyrus_server.requests) == 2
+
+
+def test_register_refreshes_outdated_model(pyrus_server, mapped_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    model = MappedModel.objects.get(form_data['id'])
+
+    pyrus_server.tasks[form_data['id']]['fields'][0]['value'] = 'changed remotely'
+    assert MappedModel.objects.get_filtered()[0] is model
+    assert model.purpose == 'IT conference in Amsterdam'
+
+    pyrus_server.tasks[form_data['id']]['last_modified_date'] = '2030-01-01T00:00:00Z'
+    assert MappedModel.objects.get_filtered()[0] is model
+    assert model.purpose == 'changed remotely'
+
+
+def test_unsaved_changes_are_kept(pyrus_server, mapped_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    model = MappedModel.objects.get(form_data['id'])
+    model.purpose = 'local edit'
+
+    pyrus_server.tasks[form_data['id']]['fields'][1]['value'] = 43
+    pyrus_server.tasks[form_data['id']]['last_modified_date'] = '2030-01-01T00:00:00Z'
+    assert MappedModel.objects.get_filtered()[0] is model
+    assert model.purpose == 'local edit'
+    assert model.counter == 42
+    assert model._changed_fields == {10}
+
+    model.save()
+    assert model.purpose == 'local edit'
+    assert model.counter == 43
+    assert not model._changed_fields
+
+
+def test_save_updates_loaded_model(pyrus_server, mapped_session, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    model = MappedModel.objects.get(form_data['id'])
+    model.counter = 1
+    model.save()
+
+    assert MappedModel.objects.get(form_data['id']) is model
+    assert model.counter == 1
+
+    new_model = MappedModel(purpose='new one')
+    new_model.save()
+    assert MappedModel.objects.get(new_model.id) is new_model
+
+
+def test_identity_map_is_bounded(form_data: dict[str, Any]) -> None:
+    identity_map = IdentityMap(maxsize=2)
+    for i in range(1, 4):
+        identity_map.get_or_load(MappedModel, {**form_data, 'id': i})
+
+    assert 1 not in identity_map
+    assert identity_map.get(MappedModel, 3).id == 3
+    assert len(identity_map) == 2
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+from typing import Any
+
+import pytest
+from pyrus.models.entities import EqualsFilter
+
+from pyrus_orm.jsoncodec import JSONCodec, MsgspecCodec, OrjsonCodec, get_default_codec
+from pyrus_orm.session import PyrusORMSession
+
+
+def _codecs() -> list[Any]:
+    return [
+        JSONCodec,
+        pytest.param(OrjsonCodec, marks=pytest.mark.skipif(not _installed('orjson'), reason='no orjson')),
+        pytest.param(MsgspecCodec, marks=pytest.mark.skipif(not _installed('msgspec'), reason='no msgspec')),
+    ]
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+class CountingCodec(JSONCodec):
+    def __init__(self):
+        self.loads_calls = 0
+        self.dumps_calls = 0
+
+    def loads(self, data: bytes) -> Any:
+        assert isinstance(data, bytes)
+        self.loads_calls += 1
+        return super().loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        self.dumps_calls += 1
+        return super().dumps(value)
+
+
+@pytest.mark.parametrize('codec_cls', _codecs())
+def test_codec_roundtrip(codec_cls, form_data: dict[str, Any]) -> None:
+    codec = codec_cls()
+    data = {**form_data, 'note': 'Ünïcødé'}
+
+    encoded = codec.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+    assert codec.loads(encoded) == data
+    with pytest.raises(TypeError):
+        codec.dumps({'value': object()})
+
+
+def test_default_codec() -> None:
+    assert get_default_codec().name == ('orjson' if _installed('orjson') else 'msgspec' if _installed('msgspec') else 'json')
+
+
+def test_session_uses_codec(pyrus_server, form_data: dict[str, Any]) -> None:
+    pyrus_server.add_task(form_data)
+    codec = CountingCodec()
+    session = PyrusORMSession(pyrus_server.make_pyrus_api(), json_codec=codec)
+
+    assert session.get_task_raw(form_data['id']) == form_data
+    tasks = session.get_filtered_tasks(
+        1,
+        filters=[EqualsFilter(10, 'IT conference in Amsterdam')],
+        modified_after=datetime(2017, 1, 1),
+    )
+
+    assert [x['id'] for x in tasks] == [form_data['id']]
+    assert codec.loads_calls == 2
+    assert codec.dumps_calls == 1
+    # request models are encoded the same way pyrus-api does it
+    request = session._make_register_request(False, (), [EqualsFilter(10, 'x')], [10], datetime(2017, 1, 1))
+    assert json.loads(session._encode_body(request)) == json.loads(session.pyrus_api.serialize_request(request))
+
+
+def test_session_codec_fallback(pyrus_server) -> None:
+    session = PyrusORMSession(pyrus_server.make_pyrus_api(), json_codec=JSONCodec())
+
+    # values the codec can't encode are left to pyrus-api
+    assert json.loads(session._encode_body({'when': datetime(2020, 1, 1)})) == {'when': '2020-01-01T00:00:00'}
@@ -0,0 +1,69 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.fields import TextField, NumericField, DateField, CatalogField
+from pyrus_orm.model import PyrusModel
+
+
+class LazyModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+    vendor = CatalogField(30, catalog_id=12345)
+    started = DateField(40)
+
+    class Meta:
+        form_id = 123
+
+
+@pytest.fixture
+def lazy_form_data(form_data: dict[str, Any]) -> dict[str, Any]:
+    form_data['fields'].append({
+        'id': 1,
+        'type': 'title',
+        'value': {
+            'fields': [
+                {'id': 40, 'type': 'date', 'value': 'not a date'},
+            ],
+        },
+    })
+    return form_data
+
+
+def test_lazy_does_not_decode_untouched_fields(lazy_form_data: dict[str, Any], session) -> None:
+    # broken date would raise on eager decoding
+    with pytest.raises(ValueError):
+        LazyModel.from_pyrus_data(lazy_form_data)
+
+    model = LazyModel.from_pyrus_data(lazy_form_data, lazy=True)
+    assert model.purpose == 'IT conference in Amsterdam'
+    assert model.counter == 42.0
+    assert model.vendor.values == {'Vendor Name': 'GE', 'Vendor Code': '123'}
+
+    with pytest.raises(ValueError):
+        _ = model.started
+
+
+def test_lazy_keeps_payload_intact(lazy_form_data: dict[str, Any], session) -> None:
+    model = LazyModel.from_pyrus_data(lazy_form_data, lazy=True)
+    model.purpose = 'changed'
+    model.counter += 1
+
+    assert lazy_form_data['fields'][0]['value'] == 'IT conference in Amsterdam'
+    assert lazy_form_data['fields'][1]['value'] == 42
+    assert 'fields' in lazy_form_data
+
+
+def test_lazy_serializes_undecoded_fields(lazy_form_data: dict[str, Any], session) -> None:
+    model = LazyModel.from_pyrus_data(lazy_form_data, lazy=True)
+    model.purpose = 'changed'
+
+    assert model.get_pyrus_fields_data() == [
+        {'id': 10, 'value': 'changed'},
+        {'id': 20, 'value': 42},
+        {'id': 30, 'value': lazy_form_data['fields'][2]['value']},
+        {'id': 40, 'value': 'not a date'},
+    ]
+    assert model.get_pyrus_fields_data(changed_only=True) == [
+        {'id': 10, 'value': 'changed'},
+    ]
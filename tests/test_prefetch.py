@@ -0,0 +1,53 @@
+from enum import Enum
+
+from pyrus_orm.errors import PyrusNotFoundError
+from pyrus_orm.fields import CatalogEnumField, CatalogField, TextField
+from pyrus_orm.model import PyrusModel
+from pyrus_orm.session import PyrusORMSession
+
+
+class Genre(Enum):
+    novel = 1
+
+
+class Book(PyrusModel):
+    title = TextField(1)
+    author = CatalogField(2, catalog_id=10)
+    publisher = CatalogField(3, catalog_id=11)
+    genre = CatalogEnumField(4, catalog_id=12, enum=Genre, id_field='item_id')
+
+    class Meta:
+        form_id = 1
+
+
+class Review(PyrusModel):
+    book_author = CatalogField(1, catalog_id=10)
+    reviewer = CatalogField(2, catalog_id=13)
+
+    class Meta:
+        form_id = 2
+
+
+def test_prefetch_catalogs(pyrus_server) -> None:
+    for catalog_id in (10, 11, 12):
+        pyrus_server.catalogs[catalog_id] = {
+            'catalog_headers': [{'name': 'Name'}],
+            'items': [{'item_id': catalog_id * 100, 'values': [f'item of {catalog_id}']}],
+        }
+    pyrus_server.delay = 0.1
+    session = PyrusORMSession(pyrus_server.make_pyrus_api())
+
+    results = session.prefetch_catalogs(Book, Review, concurrency=4)
+
+    assert [x.key for x in results] == [10, 11, 12, 13]
+    assert [x.ok for x in results] == [True, True, True, False]
+    assert isinstance(results[3].error, PyrusNotFoundError)
+    assert pyrus_server.max_in_flight == 4
+
+    for catalog_id in (10, 11, 12):
+        assert session.catalog_cache.peek(catalog_id)[0].item_id == catalog_id * 100
+
+    # cached catalogs are not fetched again
+    requests_count = len(pyrus_server.requests)
+    session.prefetch_catalogs(Book)
+    assert len(pyrus_server.requests) == requests_count
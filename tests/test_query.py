@@ -0,0 +1,95 @@
+from datetime import date
+from enum import Enum
+from typing import Any
+
+import pytest
+
+from pyrus_orm.catalog import CatalogItem
+from pyrus_orm.fields import TextField, NumericField, CatalogField, DateField, MultipleChoiceField
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+class Genre(Enum):
+    fiction = 1
+    poetry = 2
+
+
+class Book(PyrusModel):
+    title = TextField(10)
+    number = NumericField(20)
+    author = CatalogField(30, catalog_id=12345)
+    published = DateField(40)
+    genres = MultipleChoiceField(50, enum=Genre)
+
+    class Meta:
+        form_id = 321
+
+
+def _book(task_id: int, title: str, number: int, author_id: int, published: str, genres: list[int]) -> dict[str, Any]:
+    return make_task(task_id, [
+        {'id': 10, 'type': 'text', 'value': title},
+        {'id': 20, 'type': 'number', 'value': number},
+        {'id': 30, 'type': 'catalog', 'value': catalog_value(author_id)},
+        {'id': 40, 'type': 'date', 'value': published},
+        {'id': 50, 'type': 'multiple_choice', 'value': {'choice_ids': genres}},
+    ])
+
+
+@pytest.fixture
+def books(pyrus_server, server_session):
+    pyrus_server.add_task(_book(1, 'Don Quixote', 1, 100, '1605-01-01', [1]))
+    pyrus_server.add_task(_book(2, 'Don Quixote, Part Two', 2, 100, '1615-01-01', [1]))
+    pyrus_server.add_task(_book(3, 'Sonnets', 3, 200, '1609-05-20', [2]))
+    pyrus_server.add_task(_book(4, 'Hamlet', 4, 200, '1603-01-01', [1, 2]))
+
+
+def test_queryset_is_lazy(pyrus_server, books) -> None:
+    qs = Book.objects.filter(number__gt=1).only('title')
+    assert pyrus_server.requests == []
+
+    assert [x.id for x in qs.filter(number__lte=3)] == [2, 3]
+    assert len(pyrus_server.requests) == 1
+
+
+def test_filters_are_pushed_down(pyrus_server, books) -> None:
+    list(Book.objects.filter(
+        number__gt=1,
+        published__range=(date(1600, 1, 1), date(1610, 1, 1)),
+        author__in=[CatalogItem(item_id=100), 200],
+        genres__in=[Genre.poetry],
+        title__isnull=False,
+    ).only('title'))
+
+    assert pyrus_server.requests[-1][2] == {
+        'fld20': 'gt1',
+        'fld40': 'gt1599-12-31,lt1610-01-02',  # range is inclusive, it's re-checked client-side
+        'fld30': '100,200',
+        'fld50': '2',
+        'fld10': '*',
+        'field_ids': [10, 40],
+    }
+
+
+def test_range_is_inclusive(pyrus_server, books) -> None:
+    assert [x.id for x in Book.objects.filter(number__range=(1, 3))] == [1, 2, 3]
+    assert [x.id for x in Book.objects.filter(number__gt=0).filter(number__range=(1, 3))] == [1, 2, 3]
+    assert [x.id for x in Book.objects.filter(number__range=(1, 3)).filter(number__gt=1)] == [2, 3]
+    assert [x.id for x in Book.objects.filter(published__range=(date(1603, 1, 1), date(1605, 1, 1)))] == [1, 4]
+    assert pyrus_server.requests[-1][2]['fld40'] == 'gt1602-12-31,lt1605-01-02'
+
+
+def test_client_side_filters(pyrus_server, books) -> None:
+    assert [x.id for x in Book.objects.filter(title__icontains='QUIXOTE')] == [1, 2]
+    assert [x.id for x in Book.objects.filter(number__gte=2, number__lt=4)] == [2, 3]
+    assert [x.id for x in Book.objects.filter(author=CatalogItem(item_id=200)).filter(number__ne=3)] == [4]
+    assert [x.id for x in Book.objects.filter(published__range=(date(1604, 12, 31), date(1610, 1, 1)))] == [1, 3]
+    assert Book.objects.filter(title__contains='Hamlet').first().id == 4
+    assert Book.objects.filter(title='Nothing', number__gte=0).count() == 0
+
+
+def test_client_side_filters_are_requested(pyrus_server, books) -> None:
+    items = list(Book.objects.all().only('title').filter(number__gte=3))
+
+    assert [x.id for x in items] == [3, 4]
+    assert pyrus_server.requests[-1][2]['field_ids'] == [10, 20]
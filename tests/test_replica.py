@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.catalog import CatalogItem
+from pyrus_orm.fields import TextField, NumericField, CatalogField, StepField
+from pyrus_orm.model import PyrusModel
+from pyrus_orm.replica import FormReplica
+
+
+class ReplicatedModel(PyrusModel):
+    purpose = TextField(10)
+    counter = NumericField(20)
+    vendor = CatalogField(30, catalog_id=12345)
+    step = StepField(40)
+
+    class Meta:
+        form_id = 123
+
+
+@pytest.fixture
+def server_session(server_session, pyrus_server, form_data: dict[str, Any]):
+    for i in range(1, 6):
+        pyrus_server.add_task({**form_data, 'id': i, 'current_step': i % 2 + 1})
+    pyrus_server.tasks[5]['close_date'] = '2017-08-24T10:20:11Z'
+    return server_session
+
+
+def test_replica_queries(pyrus_server, server_session, tmp_path) -> None:
+    with FormReplica(ReplicatedModel, str(tmp_path / 'replica.db')) as replica:
+        assert replica.sync() == 5
+
+        assert replica.get(3).purpose == 'IT conference in Amsterdam'
+        assert replica.get(404) is None
+
+        assert [x.id for x in replica.get_filtered()] == [1, 2, 3, 4]
+        assert [x.id for x in replica.get_filtered(include_archived=True, steps=[2])] == [1, 3, 5]
+        assert replica.count(counter=42, vendor=CatalogItem(item_id=80797460)) == 4
+        assert replica.count(counter=43) == 0
+
+
+def test_replica_incremental_sync(pyrus_server, server_session, tmp_path) -> None:
+    path = str(tmp_path / 'replica.db')
+    with FormReplica(ReplicatedModel, path) as replica:
+        replica.sync()
+
+    pyrus_server.tasks[2]['fields'][0]['value'] = 'changed'
+    pyrus_server.tasks[2]['last_modified_date'] = '2030-01-01T00:00:00Z'
+
+    with FormReplica(ReplicatedModel, path) as replica:
+        replica.sync()
+        assert pyrus_server.requests[-1][2]['modified_after'] == '2017-08-23T10:20:10Z'
+        assert [x.id for x in replica.get_filtered(purpose='changed')] == [2]
+
+        del pyrus_server.tasks[4]
+        replica.sync(full=True)
+        assert 'modified_after' not in pyrus_server.requests[-1][2]
+        assert replica.count(include_archived=True) == 4
@@ -0,0 +1,117 @@
+from typing import Any
+
+import pytest
+
+from pyrus_orm.errors import PyrusAPIError, PyrusNotFoundError, PyrusRateLimitError, PyrusServerError
+from pyrus_orm.scheduler import RequestScheduler, TokenBucket, parse_retry_after
+from pyrus_orm.session import PyrusORMSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def make_session(pyrus_server, form_data: dict[str, Any]):
+    pyrus_server.add_task({**form_data, 'id': 1})
+    clock = FakeClock()
+
+    def make(**kwargs) -> PyrusORMSession:
+        scheduler = RequestScheduler(backoff=0, clock=clock, sleep=clock.sleep, **kwargs)
+        return PyrusORMSession(pyrus_server.make_pyrus_api(), scheduler=scheduler)
+
+    make.clock = clock
+    return make
+
+
+def test_token_bucket() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+    clock.now += 1
+    bucket.acquire()
+    bucket.acquire()
+    assert len(clock.sleeps) == 1
+
+
+def test_rate_limited_session(make_session) -> None:
+    session = make_session(rate=5, burst=1)
+    for _ in range(3):
+        session.get_task_raw(1)
+    assert make_session.clock.sleeps == [pytest.approx(0.2), pytest.approx(0.2)]
+
+
+def test_server_errors_are_retried(pyrus_server, make_session) -> None:
+    pyrus_server.fail_next(503, times=2)
+
+    assert make_session().get_task_raw(1)['id'] == 1
+    assert len(pyrus_server.requests) == 3
+
+
+def test_retries_are_limited(pyrus_server, make_session) -> None:
+    pyrus_server.fail_next(502, times=3)
+
+    with pytest.raises(PyrusServerError) as e:
+        make_session(max_retries=2).get_task_raw(1)
+    assert e.value.status_code == 502
+    assert len(pyrus_server.requests) == 3
+
+
+def test_non_idempotent_requests_are_not_retried(pyrus_server, make_session) -> None:
+    pyrus_server.fail_next(500)
+
+    with pytest.raises(PyrusServerError):
+        make_session().update_task(1, [])
+    assert len(pyrus_server.requests) == 1
+
+
+def test_retry_after(pyrus_server, make_session) -> None:
+    pyrus_server.fail_next(429, retry_after='7')
+
+    make_session().update_task(1, [])  # throttled requests are never processed, so they are always retried
+    assert len(pyrus_server.requests) == 2
+    assert make_session.clock.sleeps == [7]
+
+
+def test_rate_limit_error(pyrus_server, make_session) -> None:
+    pyrus_server.fail_next(429, times=2, retry_after='3')
+
+    with pytest.raises(PyrusRateLimitError) as e:
+        make_session(max_retries=1).get_task_raw(1)
+    assert e.value.retry_after == 3
+
+
+def test_api_errors(pyrus_server, make_session) -> None:
+    session = make_session()
+
+    with pytest.raises(PyrusNotFoundError) as e:
+        session.get_task_raw(404)
+    assert e.value.error_code == 'not_found'
+
+    pyrus_server.fail_next(400)
+    with pytest.raises(PyrusAPIError) as e:
+        list(session.iter_filtered_tasks(123))
+    assert e.value.status_code == 400
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
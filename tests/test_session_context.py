@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pyrus import PyrusAPI
+
+from pyrus_orm import session as session_module
+from pyrus_orm.bulk import run_bulk
+from pyrus_orm.cache import CatalogCache
+from pyrus_orm.catalog import _CatalogListWrapper
+from pyrus_orm.session import PyrusORMSession, get_session, peek_session, set_session, set_session_global
+
+
+@pytest.fixture(autouse=True)
+def no_global_session():
+    prev_value = session_module._session
+    session_module._session = None
+    yield
+    session_module._session = prev_value
+
+
+def _make_session() -> PyrusORMSession:
+    return PyrusORMSession(PyrusAPI(access_token='token'))
+
+
+def test_global_fallback() -> None:
+    assert peek_session() is None
+
+    global_session, local_session = _make_session(), _make_session()
+    set_session_global(global_session)
+    assert get_session() is global_session
+
+    with set_session(local_session):
+        assert get_session() is local_session
+    assert get_session() is global_session
+
+
+def test_threads_have_own_sessions() -> None:
+    barrier = threading.Barrier(4)
+
+    def work(_) -> bool:
+        session = _make_session()
+        with set_session(session):
+            barrier.wait(timeout=5)  # all threads have set their sessions
+            return get_session() is session
+
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(work, range(4)))
+    assert peek_session() is None
+
+
+def test_asyncio_tasks_have_own_sessions() -> None:
+    async def work() -> bool:
+        session = _make_session()
+        with set_session(session):
+            await asyncio.sleep(0.01)
+            return get_session() is session
+
+    async def main() -> list[bool]:
+        return await asyncio.gather(*(work() for _ in range(4)))
+
+    assert all(asyncio.run(main()))
+
+
+def test_bulk_workers_use_callers_session() -> None:
+    session = _make_session()
+    with set_session(session):
+        results = list(run_bulk(lambda _: get_session(), range(4), concurrency=2))
+    assert all(x.result is session for x in results)
+
+
+def test_concurrent_catalog_misses_load_once() -> None:
+    cache = CatalogCache()
+    calls = []
+
+    def loader(catalog_id: int) -> _CatalogListWrapper:
+        calls.append(catalog_id)
+        time.sleep(0.05)
+        return _CatalogListWrapper()
+
+    with ThreadPoolExecutor(8) as executor:
+        catalogs = list(executor.map(lambda _: cache.get(1, loader), range(8)))
+
+    assert calls == [1]
+    assert all(x is catalogs[0] for x in catalogs)
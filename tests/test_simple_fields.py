@@ -1,66 +1,10 @@
 import copy
 from typing import Any
 
-import pytest
-from pyrus import PyrusAPI
-
 from pyrus_orm.catalog import CatalogItem
 from pyrus_orm.fields import TextField, NumericField, CatalogField
 from pyrus_orm.model import PyrusModel
-from pyrus_orm.session import PyrusORMSession, set_session
-
-
-@pytest.fixture
-def form_data() -> dict[str, Any]:
-    return {
-        "id": 11610,
-        "create_date": "2017-08-20T12:31:14Z",
-        "last_modified_date": "2017-08-23T10:20:11Z",
-        "current_step": 1,
-        "fields": [
-            {
-                "id": 10,
-                "type": "text",
-                "name": "Purpose",
-                "value": "IT conference in Amsterdam"
-            },
-            {
-                "id": 20,
-                "type": "number",
-                "name": "counter",
-                "value": 42,
-            },
-            {
-                "id": 30,
-                "value": {
-                    "item_id": 80797460,
-                    "item_ids": [
-                        80797460
-                    ],
-                    "headers": [
-                        "Vendor Name",
-                        "Vendor Code"
-                    ],
-                    "values": [
-                        "GE",
-                        "123"
-                    ],
-                    "rows": [
-                        [
-                            "GE",
-                            "123"
-                        ]
-                    ]
-                }
-            }
-        ]
-    }
-
-
-@pytest.fixture
-def session():
-    with set_session(PyrusORMSession(PyrusAPI())):
-        yield
+from pyrus_orm.session import PyrusORMSession
 
 
 class Model(PyrusModel):
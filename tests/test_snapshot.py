@@ -0,0 +1,68 @@
+import os
+
+from pyrus_orm.session import PyrusORMSession
+from pyrus_orm.snapshot import CatalogSnapshotStore
+
+
+def test_snapshot_roundtrip(tmp_path) -> None:
+    store = CatalogSnapshotStore(tmp_path / 'catalogs')
+    assert store.load(1) is None
+
+    store.save(1, ['Name'], [(10, ['a']), (11, ['b'])])
+    assert store.load(1) == (['Name'], [(10, ['a']), (11, ['b'])])
+
+    store.delete(1)
+    assert store.load(1) is None
+
+
+def test_snapshot_max_age(tmp_path) -> None:
+    CatalogSnapshotStore(tmp_path).save(1, ['Name'], [(10, ['a'])])
+
+    assert CatalogSnapshotStore(tmp_path, max_age=60).load(1) is not None
+    assert CatalogSnapshotStore(tmp_path, max_age=-1).load(1) is None
+
+
+def test_snapshot_corrupted(tmp_path) -> None:
+    store = CatalogSnapshotStore(tmp_path)
+    store.save(1, ['Name'], [(10, ['a'])])
+
+    with open(os.path.join(tmp_path, 'catalog-1.bin'), 'r+b') as f:
+        f.seek(-3, os.SEEK_END)
+        f.truncate()
+
+    assert store.load(1) is None
+
+    with open(os.path.join(tmp_path, 'catalog-1.bin'), 'wb') as f:
+        f.write(store._magic)
+
+    assert store.load(1) is None
+
+
+def _catalog_requests(pyrus_server) -> list[str]:
+    return [path for method, path, _ in pyrus_server.requests if path.startswith('/catalogs/')]
+
+
+def test_session_uses_snapshot(tmp_path, pyrus_server) -> None:
+    pyrus_server.catalogs[5] = {
+        'catalog_id': 5,
+        'catalog_headers': [{'name': 'Name', 'type': 'text'}, {'name': 'Code', 'type': 'text'}],
+        'items': [
+            {'item_id': 1, 'values': ['GE', '123']},
+            {'item_id': 2, 'values': ['Siemens', '456']},
+        ],
+    }
+    api = pyrus_server.make_pyrus_api()
+
+    PyrusORMSession(api, catalog_snapshot=CatalogSnapshotStore(tmp_path)).get_catalog(5)
+    assert _catalog_requests(pyrus_server) == ['/catalogs/5']
+
+    session = PyrusORMSession(api, catalog_snapshot=CatalogSnapshotStore(tmp_path))
+    catalog = session.get_catalog(5)
+    assert _catalog_requests(pyrus_server) == ['/catalogs/5']
+    assert catalog.find({'Code': '456'}).item_id == 2
+    assert catalog[0].values == {'Name': 'GE', 'Code': '123'}
+
+    # refreshing catalog goes to the API
+    session.catalog_cache.invalidate(5)
+    session.get_catalog(5)
+    assert _catalog_requests(pyrus_server) == ['/catalogs/5', '/catalogs/5']
@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+import pytest
+
+from pyrus_orm.streaming import iter_json_array
+
+
+def _chunked(data: Any, size: int) -> list[bytes]:
+    raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1024])
+def test_iter_json_array(form_data: dict[str, Any], chunk_size: int) -> None:
+    tasks = [form_data, {**form_data, 'id': 1, 'note': 'Ünïcødé'}, {'id': 2, 'fields': []}]
+    other_values: dict[str, Any] = {}
+
+    items = list(iter_json_array(
+        _chunked({'total': 12345, 'tasks': tasks, 'flag': True}, chunk_size),
+        'tasks',
+        other_values,
+    ))
+
+    assert items == tasks
+    assert other_values == {'total': 12345, 'flag': True}
+
+
+@pytest.mark.parametrize('data', [{}, {'tasks': []}, {'error': 'access denied'}])
+def test_iter_json_array_no_items(data: dict[str, Any]) -> None:
+    other_values: dict[str, Any] = {}
+
+    assert list(iter_json_array(_chunked(data, 2), 'tasks', other_values)) == []
+    assert other_values == {k: v for k, v in data.items() if k != 'tasks'}
+
+
+def test_iter_json_array_truncated() -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"tasks": [{"id": 1}, {"id"'], 'tasks'))
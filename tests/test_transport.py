@@ -0,0 +1,92 @@
+import threading
+from typing import Any
+
+import pytest
+import requests
+
+from pyrus_orm.errors import PyrusConnectionError
+from pyrus_orm.scheduler import RequestScheduler
+from pyrus_orm.session import PyrusORMSession
+from pyrus_orm.transport import HTTPTransport
+
+
+@pytest.fixture
+def task(form_data: dict[str, Any]) -> dict[str, Any]:
+    return {**form_data, 'id': 1}
+
+
+def test_connections_are_reused(pyrus_server, task) -> None:
+    pyrus_server.add_task(task)
+    session = PyrusORMSession(pyrus_server.make_pyrus_api())
+
+    for _ in range(5):
+        session.get_task_raw(1)
+    list(session.iter_filtered_tasks(123))
+    session.get_filtered_tasks(123)
+
+    assert len(pyrus_server.requests) == 7
+    assert len(pyrus_server.connections) == 1
+    session.close()
+
+
+def test_pool_is_shared_by_threads(pyrus_server, task) -> None:
+    pyrus_server.add_task(task)
+    transport = HTTPTransport(pool_size=2)
+    session = PyrusORMSession(pyrus_server.make_pyrus_api(), transport=transport)
+
+    http_sessions = []
+
+    def work() -> None:
+        session.get_task_raw(1)
+        http_sessions.append(transport._get_http())
+
+    for _ in range(3):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    assert len(set(map(id, http_sessions))) == 3  # a requests.Session per thread
+    assert len(pyrus_server.connections) == 1
+    session.close()
+
+
+def test_gzip_response(pyrus_server, task) -> None:
+    pyrus_server.add_task(task)
+    pyrus_server.gzip = True
+    session = PyrusORMSession(pyrus_server.make_pyrus_api())
+
+    assert session.get_task_raw(1)['id'] == 1
+    assert [x['id'] for x in session.iter_filtered_tasks(123)] == [1]
+
+
+def test_timeout(pyrus_server, task) -> None:
+    pyrus_server.add_task(task)
+    pyrus_server.delay = 0.5
+    session = PyrusORMSession(
+        pyrus_server.make_pyrus_api(),
+        transport=HTTPTransport(timeout=0.05),
+        scheduler=RequestScheduler(max_retries=0),
+    )
+
+    with pytest.raises(PyrusConnectionError):
+        session.get_task_raw(1)
+
+    assert session._request_json('GET', '/tasks/1', timeout=5)['task']['id'] == 1
+
+
+def test_custom_transport(pyrus_server, task) -> None:
+    pyrus_server.add_task(task)
+
+    urls = []
+
+    class RecordingTransport(HTTPTransport):
+        def request(self, method: str, url: str, **kwargs) -> requests.Response:
+            urls.append(url)
+            return super().request(method, url, **kwargs)
+
+    transport = RecordingTransport(pool_size=2)
+    api = pyrus_server.make_pyrus_api()
+    session = PyrusORMSession(api, transport=transport)
+    session.get_task_raw(1)
+
+    assert urls == [api._create_url('/tasks/1')]
@@ -0,0 +1,81 @@
+from datetime import date
+from enum import Enum
+from typing import Any
+
+import pytest
+
+from pyrus_orm.fields import (
+    CatalogEnumField, CatalogField, CheckmarkField, DateField, MultipleChoiceField, NumericField, TextField,
+)
+from pyrus_orm.model import PyrusModel
+from tests.conftest import catalog_value, make_task
+
+
+class Genre(Enum):
+    fiction = 1
+    poetry = 2
+
+
+class Language(Enum):
+    spanish = 'es'
+    english = 'en'
+
+
+class Book(PyrusModel):
+    title = TextField(10)
+    number = NumericField(20)
+    author = CatalogField(30, catalog_id=12345)
+    published = DateField(40)  # inside the title field
+    genres = MultipleChoiceField(50, enum=Genre)
+    language = CatalogEnumField(60, catalog_id=555, enum=Language, id_field='Code')
+    read = CheckmarkField(70)
+
+    class Meta:
+        form_id = 321
+
+
+def _book(task_id: int, title: str, author: str, published: str, language: str) -> dict[str, Any]:
+    return make_task(task_id, [
+        {'id': 10, 'type': 'text', 'value': title},
+        {'id': 20, 'type': 'number', 'value': task_id},
+        {'id': 30, 'type': 'catalog', 'value': catalog_value(task_id * 100, ['Name'], [author])},
+        {'id': 100, 'type': 'title', 'value': {'fields': [
+            {'id': 40, 'type': 'date', 'value': published},
+        ]}},
+        {'id': 50, 'type': 'multiple_choice', 'value': {'choice_ids': [1]}},
+        {'id': 60, 'type': 'catalog', 'value': catalog_value(1, ['Code'], [language])},
+    ])
+
+
+@pytest.fixture
+def books(pyrus_server, server_session):
+    pyrus_server.add_task(_book(1, 'Don Quixote', 'Cervantes', '1605-01-01', 'es'))
+    pyrus_server.add_task(_book(2, 'Hamlet', 'Shakespeare', '1603-01-01', 'en'))
+
+
+def test_values(pyrus_server, books) -> None:
+    rows = Book.objects.values('id', 'title', 'author', 'published', 'language', 'read')
+
+    assert rows == [
+        {'id': 1, 'title': 'Don Quixote', 'author': {'Name': 'Cervantes'}, 'published': date(1605, 1, 1),
+         'language': Language.spanish, 'read': False},
+        {'id': 2, 'title': 'Hamlet', 'author': {'Name': 'Shakespeare'}, 'published': date(1603, 1, 1),
+         'language': Language.english, 'read': False},
+    ]
+    assert pyrus_server.requests[-1][2]['field_ids'] == [10, 30, 40, 60, 70]
+
+
+def test_values_match_as_dict(pyrus_server, books) -> None:
+    rows = Book.objects.values(title='Hamlet')
+
+    assert rows == [{'id': 2, **x.as_dict()} for x in Book.objects.get_filtered(title='Hamlet')]
+
+
+def test_values_list(pyrus_server, books) -> None:
+    assert Book.objects.values_list('id', 'genres') == [(1, {Genre.fiction}), (2, {Genre.fiction})]
+    assert Book.objects.values_list('number', flat=True, title='Hamlet') == [2]
+    assert Book.objects.values_list('id', flat=True) == [1, 2]
+    assert pyrus_server.requests[-1][2] == {'field_ids': [10]}
+
+    with pytest.raises(AssertionError):
+        Book.objects.values_list('id', 'title', flat=True)